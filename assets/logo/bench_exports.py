@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Cold-run timing of generate_exports.py across worker counts.
+Each run gets a fresh copy of the sources (empty render cache), and every
+run's outputs are checked byte-for-byte against the serial run.
+
+  python3 assets/logo/bench_exports.py --workers 1 2 4 8
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import tempfile
+import subprocess
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SOURCES = ["generate_exports.py", "paige-logo-source.svg"]
+
+def run_cold(workers):
+    """Run the exporter in a scratch tree; returns (seconds, {output: sha256})"""
+    root = tempfile.mkdtemp(prefix="logo-bench-")
+    try:
+        logo_dir = os.path.join(root, "assets", "logo")
+        os.makedirs(logo_dir)
+        for name in SOURCES:
+            shutil.copy(os.path.join(HERE, name), logo_dir)
+        start = time.perf_counter()
+        subprocess.run([sys.executable, os.path.join(logo_dir, "generate_exports.py"), "--workers", str(workers)],
+                       cwd=root, check=True, stdout=subprocess.DEVNULL)
+        elapsed = time.perf_counter() - start
+        hashes = {}
+        for dirpath, dirnames, filenames in os.walk(logo_dir):
+            dirnames[:] = [d for d in dirnames if d not in (".render-cache", "__pycache__")]
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                if name not in SOURCES:
+                    with open(path, 'rb') as f:
+                        hashes[os.path.relpath(path, logo_dir)] = hashlib.sha256(f.read()).hexdigest()
+        return elapsed, hashes
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Benchmark logo exports across worker counts")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1],
+                        help="worker counts to time (1 = serial baseline)")
+    parser.add_argument('--repeat', type=int, default=3, help="cold runs per worker count (best is reported)")
+    parser.add_argument('--json', help="write results JSON here")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    counts = [1] + sorted(set(args.workers) - {1})
+
+    print("⏱️  Logo export benchmark (cold render cache)")
+    print("=" * 50)
+
+    results = []
+    baseline = None
+    for workers in counts:
+        runs = [run_cold(workers) for _ in range(args.repeat)]
+        best = min(elapsed for elapsed, _ in runs)
+        if baseline is None:
+            baseline, reference = best, runs[0][1]
+        identical = all(hashes == reference for _, hashes in runs)
+        results.append({'workers': workers, 'best_s': round(best, 3), 'speedup': round(baseline / best, 2),
+                        'identical': identical})
+        print(f"   {workers:>2} workers  {best:>7.2f}s  {baseline / best:>5.2f}x  "
+              f"{'✓ identical' if identical else '❌ outputs differ'}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Results written to {args.json}")
+
+    if not all(r['identical'] for r in results):
+        print("\n❌ Parallel outputs differ from the serial run")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -2,25 +2,142 @@
 """
 Generate all logo exports from SVG source.
 Creates PNGs at multiple sizes and favicon.ico
+
+Every raster is cached by (SVG content hash, size, background) in memory
+for the run and as a PNG under .render-cache/ between runs, and outputs
+whose inputs haven't changed are skipped without rendering or decoding.
+PIL and cairosvg are only imported when something actually needs rendering.
+
+Exports are a declarative job list (export_jobs) run on a process pool:
+one task per distinct raster writes every PNG built from it, then
+multi-size outputs (favicon.ico) are assembled from the cached rasters.
+Output bytes don't depend on the worker count.
+
+Every PNG export also gets web-optimized variants under web/ (optimized
+PNG, palette-quantized when that's visually lossless, lossless WebP and
+quality-tuned lossy WebP). manifest.json lists each asset's bytes,
+dimensions, sha256 and cache-busting name, and the run fails if an asset
+is over its size budget.
 """
 
-from PIL import Image, ImageDraw
-import cairosvg
+import hashlib
+import argparse
+import fnmatch
+import json
+import math
+import time
+import sys
 import io
 import os
+from concurrent.futures import ProcessPoolExecutor
 
 # Configuration
-SOURCE_SVG = "assets/logo/paige-logo-source.svg"
-OUTPUT_DIR = "assets/logo"
+OUTPUT_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_SVG = os.path.join(OUTPUT_DIR, "paige-logo-source.svg")
+CACHE_DIR = os.path.join(OUTPUT_DIR, ".render-cache")
+OUTPUTS_MANIFEST = os.path.join(CACHE_DIR, "outputs.json")
+WEB_DIR = os.path.join(OUTPUT_DIR, "web")
+ASSET_MANIFEST = os.path.join(OUTPUT_DIR, "manifest.json")
 VIOLET = "#7c3aed"
 WHITE = "#ffffff"
 BLACK = "#000000"
 
 # Sizes to generate
 SIZES = [512, 256, 128, 32]
+ICO_SIZES = [16, 32, 48, 64]
+
+# Web variants: palette PNGs and lossy WebPs are only used when their PSNR
+# against the full RGBA raster is at least this (dB); lossy WebP takes the
+# lowest quality that passes
+PALETTE_MIN_PSNR = 45.0
+WEBP_MIN_PSNR = 42.0
+WEBP_QUALITIES = [95, 90, 85, 80, 75, 70]
+# libwebp effort; 6 is ~40x slower on the 2000px logo for <1% smaller files
+WEBP_METHOD = 4
+
+# Size budgets in KB, first matching pattern (relative to OUTPUT_DIR) wins
+SIZE_BUDGETS = [
+    ("favicon.ico", 16),
+    ("web/logo-horizontal*", 200),
+    ("web/*", 64),
+]
+
+# Rasters rendered (or loaded from disk) this run, by cache key
+_rasters = {}
+# output path -> {key, size, mtime_ns} of the file we last wrote there
+_outputs = None
+_renderer = None
+
+def renderer_version():
+    """cairosvg version, part of every cache key so a renderer upgrade re-renders"""
+    global _renderer
+    if _renderer is None:
+        try:
+            from importlib.metadata import version
+            _renderer = version('CairoSVG')
+        except Exception:
+            _renderer = 'unknown'
+    return _renderer
+
+def raster_key(svg_content, size, bg_color=None):
+    """Content address of one raster"""
+    ident = json.dumps([hashlib.sha256(svg_content.encode('utf-8')).hexdigest(),
+                        size, bg_color, renderer_version()])
+    return hashlib.sha256(ident.encode('utf-8')).hexdigest()
+
+def load_outputs():
+    """Record of what each output was last built from"""
+    global _outputs
+    if _outputs is None:
+        try:
+            with open(OUTPUTS_MANIFEST) as f:
+                _outputs = json.load(f)
+        except (OSError, ValueError):
+            _outputs = {}
+    return _outputs
 
-def svg_to_png(svg_content, size, output_path, bg_color=None):
-    """Convert SVG to PNG at given size."""
+def save_outputs():
+    """Persist the outputs record (atomically)"""
+    if _outputs is None:
+        return
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = OUTPUTS_MANIFEST + ".tmp"
+    with open(tmp, 'w') as f:
+        json.dump(_outputs, f, indent=2, sort_keys=True)
+    os.replace(tmp, OUTPUTS_MANIFEST)
+
+def output_is_current(output_path, key):
+    """True if output_path was built from `key` and hasn't been touched since"""
+    entry = load_outputs().get(output_path)
+    if not entry or entry['key'] != key:
+        return False
+    try:
+        st = os.stat(output_path)
+    except OSError:
+        return False
+    return entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns
+
+def record_output(output_path, key):
+    st = os.stat(output_path)
+    load_outputs()[output_path] = {'key': key, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+def render_raster(svg_content, size, bg_color=None):
+    """RGBA image of the SVG at `size`, composited on `bg_color`: from this
+    run's memo, else the on-disk cache, else rendered with cairosvg"""
+    from PIL import Image
+
+    key = raster_key(svg_content, size, bg_color)
+    if key in _rasters:
+        return _rasters[key]
+
+    cache_path = os.path.join(CACHE_DIR, key + ".png")
+    if os.path.exists(cache_path):
+        img = Image.open(cache_path)
+        img.load()
+        _rasters[key] = img
+        return img
+
+    import cairosvg
     # Parse size
     png_data = cairosvg.svg2png(
         bytestring=svg_content.encode('utf-8'),
@@ -43,46 +160,15 @@ def svg_to_png(svg_content, size, output_path, bg_color=None):
     if img.mode != 'RGBA':
         img = img.convert('RGBA')
     
-    img.save(output_path, 'PNG')
-    print(f"✓ Created {output_path}")
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = f"{cache_path}.{os.getpid()}.tmp"
+    img.save(tmp, 'PNG')
+    os.replace(tmp, cache_path)
+    _rasters[key] = img
     return img
 
-def create_favicon_ico():
-    """Create multi-resolution favicon.ico"""
-    ico_path = os.path.join(OUTPUT_DIR, "favicon.ico")
-    
-    # Read source SVG
-    with open(SOURCE_SVG, 'r') as f:
-        svg_content = f.read()
-    
-    # Generate sizes for ICO (common favicon sizes)
-    ico_sizes = [16, 32, 48, 64]
-    images = []
-    
-    for size in ico_sizes:
-        png_data = cairosvg.svg2png(
-            bytestring=svg_content.encode('utf-8'),
-            output_width=size,
-            output_height=size
-        )
-        img = Image.open(io.BytesIO(png_data))
-        if img.mode != 'RGBA':
-            img = img.convert('RGBA')
-        images.append(img)
-    
-    # Save as ICO
-    images[0].save(
-        ico_path,
-        format='ICO',
-        sizes=[(s, s) for s in ico_sizes],
-        append_images=images[1:]
-    )
-    print(f"✓ Created {ico_path}")
-
-def create_logo_mark():
-    """Create icon-only mark (no background circle)""e
-    This is a simplified version just showing the P symbol"""
-    svg_content = '''<svg xmlns="http://www.w3.org/2000/svg" viewBox="22 22 56 56">
+# Icon-only mark (no background circle): a simplified version just showing the P symbol
+LOGO_MARK_SVG = '''<svg xmlns="http://www.w3.org/2000/svg" viewBox="22 22 56 56">
   <rect x="28" y="22" width="14" height="56" rx="2" fill="#7c3aed"/>
   <path d="M28 22 L62 22 C68 22 72 26 72 32 L72 38 C72 44 68 48 62 48 L42 48" 
         stroke="#7c3aed" stroke-width="14" stroke-linecap="round" fill="none"/>
@@ -90,14 +176,9 @@ def create_logo_mark():
         stroke="#7c3aed" stroke-width="7" stroke-linecap="round" fill="none"/>
   <circle cx="57" cy="35" r="5" fill="#ffffff"/>
 </svg>'''
-    
-    for size in [512, 256, 128, 64, 32]:
-        output_path = os.path.join(OUTPUT_DIR, f"logo-mark-{size}.png")
-        svg_to_png(svg_content, size, output_path)
 
-def create_horizontal_logo():
-    """Create horizontal logo with text"""
-    svg_content = '''<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 320 100" width="320" height="100">
+# Horizontal logo with text
+HORIZONTAL_SVG = '''<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 320 100" width="320" height="100">
   <!-- Logo mark (left side, slightly smaller) -->
   <g transform="translate(-10, 0) scale(0.9)">
     <circle cx="50" cy="50" r="46" fill="#7c3aed"/>
@@ -113,13 +194,9 @@ def create_horizontal_logo():
   <text x="100" y="62" font-family="-apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif" 
         font-size="38" font-weight="600" fill="#7c3aed">Agent Paige</text>
 </svg>'''
-    
-    output_path = os.path.join(OUTPUT_DIR, "logo-horizontal.png")
-    svg_to_png(svg_content, 2000, output_path)
 
-def create_social_avatar():
-    """Create 1:1 social avatar optimized for Twitter/GitHub"""
-    svg_content = '''<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100">
+# 1:1 social avatar optimized for Twitter/GitHub
+SOCIAL_AVATAR_SVG = '''<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100">
   <!-- Slightly larger design for social avatars -->
   <g transform="scale(1.1) translate(-5, -5)">
     <circle cx="50" cy="50" r="46" fill="#7c3aed"/>
@@ -131,13 +208,246 @@ def create_social_avatar():
     <circle cx="57" cy="35" r="5" fill="#7c3aed"/>
   </g>
 </svg>'''
-    
+
+def export_job(group, svg_content, sizes, filename, fmt='PNG', bg_color=None):
+    """One export: the SVG, raster size(s), background, format and output path"""
+    return {
+        'group': group,
+        'svg': svg_content,
+        'sizes': sizes,
+        'background': bg_color,
+        'format': fmt,
+        'output': os.path.join(OUTPUT_DIR, filename),
+    }
+
+def export_jobs(source_svg):
+    """Every export, in report order"""
+    jobs = []
+    for size in SIZES:
+        jobs.append(export_job("Full logo (with background circle)", source_svg, [size], f"logo-{size}.png"))
+    for size in [512, 256, 128, 64, 32]:
+        jobs.append(export_job("Logo mark (icon only)", LOGO_MARK_SVG, [size], f"logo-mark-{size}.png"))
+    # Multi-resolution favicon (common favicon sizes), built from the rendered rasters
+    jobs.append(export_job("Favicon", source_svg, ICO_SIZES, "favicon.ico", fmt='ICO'))
+    jobs.append(export_job("Horizontal logo", HORIZONTAL_SVG, [2000], "logo-horizontal.png"))
     # Create at 400x400 (optimal for Twitter/GitHub)
-    output_path = os.path.join(OUTPUT_DIR, "social-avatar.png")
-    svg_to_png(svg_content, 400, output_path)
+    jobs.append(export_job("Social avatar", SOCIAL_AVATAR_SVG, [400], "social-avatar.png"))
+    return jobs
 
-def main():
+def web_jobs(jobs):
+    """Web-optimized variants of every PNG export"""
+    variants = []
+    for job in jobs:
+        if job['format'] != 'PNG':
+            continue
+        stem = os.path.splitext(os.path.basename(job['output']))[0]
+        variant = dict(job, group="Web-optimized variants", format='WEB',
+                       output=os.path.join(WEB_DIR, stem + ".png"))
+        variant['variants'] = [variant['output'],
+                               os.path.join(WEB_DIR, stem + ".webp"),
+                               os.path.join(WEB_DIR, stem + "-lossy.webp")]
+        variants.append(variant)
+    return variants
+
+def job_outputs(job):
+    return job.get('variants') or [job['output']]
+
+def web_settings():
+    """Everything besides the raster that decides web variant bytes"""
+    try:
+        from importlib.metadata import version
+        pillow = version('Pillow')
+    except Exception:
+        pillow = 'unknown'
+    return [PALETTE_MIN_PSNR, WEBP_MIN_PSNR, WEBP_QUALITIES, WEBP_METHOD, pillow]
+
+def job_key(job):
+    """Cache key of a job's output: its raster's key, or all of them for multi-size outputs"""
+    keys = [raster_key(job['svg'], size, job['background']) for size in job['sizes']]
+    if job['format'] == 'WEB':
+        keys.append(json.dumps(web_settings()))
+    if len(keys) == 1:
+        return keys[0]
+    return hashlib.sha256(''.join(keys).encode()).hexdigest()
+
+def render_outputs(svg_content, size, bg_color, output_paths):
+    """Task: render one raster (or load it from the cache) and write every PNG built from it"""
+    img = render_raster(svg_content, size, bg_color)
+    for output_path in output_paths:
+        img.save(output_path, 'PNG')
+    return output_paths
+
+def build_ico(job):
+    """Task: assemble a multi-size ICO from already-rendered rasters"""
+    sizes = job['sizes']
+    images = [render_raster(job['svg'], size, job['background']) for size in sizes]
+    images[0].save(
+        job['output'],
+        format='ICO',
+        sizes=[(s, s) for s in sizes],
+        append_images=images[1:]
+    )
+    return [job['output']]
+
+def psnr(img, other):
+    """Peak signal-to-noise ratio (dB) between two RGBA images"""
+    from PIL import ImageChops, ImageStat
+    rms = ImageStat.Stat(ImageChops.difference(img, other.convert('RGBA'))).rms
+    mse = sum(r * r for r in rms) / len(rms)
+    return math.inf if mse == 0 else 20 * math.log10(255 / math.sqrt(mse))
+
+def encode(img, fmt, **params):
+    buf = io.BytesIO()
+    img.save(buf, fmt, **params)
+    return buf.getvalue()
+
+def write_atomic(path, data):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+def build_web_variants(job):
+    """Task: optimized PNG (palette when visually lossless), lossless and lossy WebP"""
+    from PIL import Image
+    img = render_raster(job['svg'], job['sizes'][0], job['background'])
+    png_path, webp_path, lossy_path = job['variants']
+
+    png = encode(img, 'PNG', optimize=True)
+    palette = img.quantize(256, method=Image.Quantize.FASTOCTREE)
+    if psnr(img, palette) >= PALETTE_MIN_PSNR:
+        png = min(png, encode(palette, 'PNG', optimize=True), key=len)
+
+    lossless = encode(img, 'WEBP', lossless=True, quality=100, method=WEBP_METHOD)
+    lossy = None
+    for quality in WEBP_QUALITIES:
+        candidate = encode(img, 'WEBP', quality=quality, method=WEBP_METHOD)
+        if psnr(img, Image.open(io.BytesIO(candidate))) < WEBP_MIN_PSNR:
+            break
+        lossy = candidate
+    # Nothing passed: the lossless encoding is the quality-tuned one
+    lossy = min(lossy or lossless, lossless, key=len)
+
+    os.makedirs(WEB_DIR, exist_ok=True)
+    for path, data in ((png_path, png), (webp_path, lossless), (lossy_path, lossy)):
+        write_atomic(path, data)
+    return job['variants']
+
+# Tasks for outputs built from already-rendered rasters
+DEPENDENT_TASKS = {'ICO': build_ico, 'WEB': build_web_variants}
+
+def build_dependent(job):
+    return DEPENDENT_TASKS[job['format']](job)
+
+def run_jobs(jobs, workers=1):
+    """Run export jobs; returns {output path: 'created' | 'unchanged'}.
+
+    Stage 1 renders each distinct raster once (PNG outputs sharing a raster
+    are written by the same task, and rasters only needed by ICOs are
+    rendered into the cache). Stage 2 builds outputs that depend on several
+    rasters or need optimizing (ICOs, web variants). workers=1 runs
+    everything in this process.
+    """
+    status = {}
+    pending = []
+    for job in jobs:
+        key = job_key(job)
+        if all(output_is_current(path, key) for path in job_outputs(job)):
+            status.update((path, 'unchanged') for path in job_outputs(job))
+        else:
+            pending.append((job, key))
+
+    rasters = {}
+    for job, key in pending:
+        for size in job['sizes']:
+            task = rasters.setdefault(raster_key(job['svg'], size, job['background']),
+                                      (job['svg'], size, job['background'], []))
+            if job['format'] == 'PNG':
+                task[3].append(job['output'])
+    dependent = [(job, key) for job, key in pending if job['format'] != 'PNG']
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 and pending else None
+    try:
+        stages = [list(rasters.values()), [(job,) for job, _ in dependent]]
+        for stage, task_fn in zip(stages, (render_outputs, build_dependent)):
+            if pool:
+                results = pool.map(task_fn, *zip(*stage)) if stage else []
+            else:
+                results = [task_fn(*args) for args in stage]
+            for written in results:
+                for output_path in written:
+                    status[output_path] = 'created'
+    finally:
+        if pool:
+            pool.shutdown()
+
+    # Record outputs in this process (workers can't update the manifest)
+    for job, key in pending:
+        for path in job_outputs(job):
+            record_output(path, key)
+    return status
+
+def cache_busted_name(path, digest):
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.{digest[:10]}{ext}"
+
+def build_manifest(jobs):
+    """{asset path relative to OUTPUT_DIR: bytes, dimensions, sha256, cache-busting name}"""
+    manifest = {}
+    for job in jobs:
+        size = max(job['sizes'])
+        for path in job_outputs(job):
+            with open(path, 'rb') as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+            name = os.path.relpath(path, OUTPUT_DIR)
+            manifest[name] = {
+                'bytes': os.path.getsize(path),
+                'width': size,
+                'height': size,
+                'sha256': digest,
+                'hashed_name': cache_busted_name(name, digest),
+            }
+            if len(job['sizes']) > 1:
+                manifest[name]['sizes'] = job['sizes']
+    return manifest
+
+def save_manifest(manifest):
+    write_atomic(ASSET_MANIFEST, (json.dumps(manifest, indent=2, sort_keys=True) + "\n").encode())
+
+def over_budget(manifest, budgets):
+    """[(asset, bytes, budget bytes)] for assets over their budget"""
+    failures = []
+    for name, entry in sorted(manifest.items()):
+        for pattern, limit_kb in budgets:
+            if fnmatch.fnmatch(name, pattern):
+                if entry['bytes'] > limit_kb * 1024:
+                    failures.append((name, entry['bytes'], int(limit_kb * 1024)))
+                break
+    return failures
+
+def parse_budget(value):
+    """PATTERN=KB"""
+    pattern, _, limit = value.rpartition('=')
+    try:
+        if pattern:
+            return pattern, float(limit)
+    except ValueError:
+        pass
+    raise argparse.ArgumentTypeError(f"expected PATTERN=KB, got {value!r}")
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Generate all logo exports from SVG source")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="render processes (default: all CPUs; 1 = serial)")
+    parser.add_argument('--budget', type=parse_budget, action='append', default=[], metavar='PATTERN=KB',
+                        help="size budget for assets matching PATTERN (overrides the defaults; repeatable)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
     print("🎨 Generating Agent Paige logo exports...\n")
+    start = time.perf_counter()
     
     # Ensure output directory exists
     os.makedirs(OUTPUT_DIR, exist_ok=True)
@@ -146,25 +456,36 @@ def main():
     with open(SOURCE_SVG, 'r') as f:
         svg_content = f.read()
     
-    # Generate full logo PNGs
-    print("📦 Full logo (with background circle):")
-    for size in SIZES:
-        output_path = os.path.join(OUTPUT_DIR, f"logo-{size}.png")
-        svg_to_png(svg_content, size, output_path)
-    
-    print("\n📦 Logo mark (icon only):")
-    create_logo_mark()
-    
-    print("\n📦 Favicon:")
-    create_favicon_ico()
+    jobs = export_jobs(svg_content)
+    jobs += web_jobs(jobs)
+    status = run_jobs(jobs, args.workers)
+    save_outputs()
+    manifest = build_manifest(jobs)
+    save_manifest(manifest)
     
-    print("\n📦 Horizontal logo:")
-    create_horizontal_logo()
+    group = None
+    for job in jobs:
+        if job['group'] != group:
+            if group is not None:
+                print()
+            group = job['group']
+            print(f"📦 {group}:")
+        for path in job_outputs(job):
+            kb = manifest[os.path.relpath(path, OUTPUT_DIR)]['bytes'] / 1024
+            if status[path] == 'created':
+                print(f"✓ Created {path} ({kb:.1f} KB)")
+            else:
+                print(f"· Unchanged {path} ({kb:.1f} KB)")
     
-    print("\n📦 Social avatar:")
-    create_social_avatar()
+    print(f"\n🧾 Manifest written to {ASSET_MANIFEST}")
+    failures = over_budget(manifest, args.budget + SIZE_BUDGETS)
+    if failures:
+        print("\n❌ Size budget exceeded:")
+        for name, size, limit in failures:
+            print(f"   {name}: {size / 1024:.1f} KB > {limit / 1024:.1f} KB")
+        sys.exit(1)
     
-    print("\n✅ All exports complete!")
+    print(f"\n✅ All exports complete! ({time.perf_counter() - start:.2f}s, {args.workers} workers)")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+bench-research-import.py - Synthetic-corpus benchmark for research-import.py
+
+Generates RESEARCH-*-YYYY-MM-DD.md corpora, imports them into a throwaway
+SQLite DB with the artifacts schema, and times three scenarios per corpus:
+
+  cold         first import into an empty DB
+  warm         immediate re-run with nothing changed
+  incremental  re-run after editing 1% of the files
+
+Each scenario runs in its own subprocess so peak RSS is per scenario.
+Results are written as JSON for comparison across commits:
+
+  ./bench-research-import.py --sizes 1000,10000 --output before.json
+  ./bench-research-import.py --import-args="--bulk --workers 4" --output after.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shlex
+import shutil
+import sqlite3
+import argparse
+import platform
+import resource
+import tempfile
+import subprocess
+import contextlib
+import io
+import re
+from datetime import date, timedelta
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+IMPORTER = os.path.join(HERE, "research-import.py")
+
+# Mirrors the Documentation Hub's artifacts table
+ARTIFACTS_SCHEMA = """
+    CREATE TABLE artifacts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        artifact_number TEXT UNIQUE NOT NULL,
+        title TEXT NOT NULL,
+        description TEXT,
+        file_name TEXT,
+        file_size INTEGER,
+        mime_type TEXT,
+        content_hash TEXT,
+        content TEXT,
+        created_by TEXT,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+TOPICS = ["ANALYTICS", "API-DEPLOY", "X-API", "MOLTUNI", "QMD-MEMORY", "PAYMENTS", "HOSTING", "SEO"]
+
+def generate_corpus(memory_dir, count, median_kb, sigma, dup_ratio, seed):
+    """Write `count` research files; returns total bytes written.
+
+    Sizes are log-normal around `median_kb`; `dup_ratio` of the files are
+    byte-identical copies of an earlier file under a new name.
+    """
+    rng = random.Random(seed)
+    vocab = [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(3, 10)))
+             for _ in range(5000)]
+    start = date(2025, 1, 1)
+    os.makedirs(memory_dir, exist_ok=True)
+    originals = []
+    total = 0
+    for i in range(count):
+        topic = rng.choice(TOPICS)
+        day = start + timedelta(days=rng.randrange(730))
+        filename = f"RESEARCH-{topic}-{i:06d}-{day.isoformat()}.md"
+        if originals and rng.random() < dup_ratio:
+            body = rng.choice(originals)
+        else:
+            target = int(rng.lognormvariate(0, sigma) * median_kb * 1024)
+            lines = [f"# {topic.title()} research #{i}", "", f"**Date:** {day.isoformat()}", ""]
+            size = 0
+            while size < target:
+                if rng.random() < 0.1:
+                    line = f"## {' '.join(rng.choices(vocab, k=4))}"
+                else:
+                    line = ' '.join(rng.choices(vocab, k=rng.randint(8, 24))) + '.'
+                lines.append(line)
+                size += len(line) + 1
+            body = '\n'.join(lines) + '\n'
+            originals.append(body)
+        with open(os.path.join(memory_dir, filename), 'w', encoding='utf-8') as f:
+            f.write(body)
+        total += len(body.encode('utf-8'))
+    return total
+
+def touch_corpus(memory_dir, fraction, seed):
+    """Append a line to `fraction` of the files so they re-import as new revisions"""
+    rng = random.Random(seed)
+    names = sorted(os.listdir(memory_dir))
+    changed = rng.sample(names, max(1, int(len(names) * fraction)))
+    for name in changed:
+        with open(os.path.join(memory_dir, name), 'a', encoding='utf-8') as f:
+            f.write(f"\nUpdated {rng.random():.6f}\n")
+    return len(changed)
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list (None when empty)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))]
+
+def peak_rss_mb():
+    """Peak RSS of this process and its reaped children in MB"""
+    scale = 1 if sys.platform == 'darwin' else 1024  # bytes on macOS, KB elsewhere
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return round(peak * scale / (1024 * 1024), 1)
+
+def run_scenario(root, import_args):
+    """Child process: run one import against `root` and print its measurements as JSON.
+
+    Per-file latency is the wall time the writer spends on each file that
+    reaches it (read/hash/parse, duplicate checks, staging, plus the commit
+    when that file fills a batch). Files skipped on stat never reach the
+    writer and are only reflected in the total time.
+    """
+    # Importable under a real module name so worker pools can pickle it
+    # under both fork and spawn
+    shim_dir = os.path.join(root, "shim")
+    os.makedirs(shim_dir, exist_ok=True)
+    shim = os.path.join(shim_dir, "research_import.py")
+    if not os.path.exists(shim):
+        os.symlink(IMPORTER, shim)
+    sys.path.insert(0, shim_dir)
+    import research_import
+
+    research_import.MEMORY_DIR = os.path.join(root, "memory")
+    research_import.DB_PATH = os.path.join(root, "remy.db")
+    research_import.IMPORTED_LOG = os.path.join(root, "research-imported.log")
+
+    latencies = []
+    iter_prepared = research_import.iter_prepared
+
+    def timed_iter_prepared(*args, **kwargs):
+        last = time.perf_counter()
+        for item in iter_prepared(*args, **kwargs):
+            yield item
+            now = time.perf_counter()
+            latencies.append((now - last) * 1000)
+            last = now
+
+    research_import.iter_prepared = timed_iter_prepared
+
+    output = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        research_import.main(import_args)
+    elapsed = time.perf_counter() - start
+
+    counts = dict(re.findall(r"^\s+(Imported|Skipped|Errors): (\d+) files$", output.getvalue(), re.M))
+    print(json.dumps({
+        'seconds': round(elapsed, 4),
+        'files_processed': len(latencies),
+        'imported': int(counts.get('Imported', 0)),
+        'skipped': int(counts.get('Skipped', 0)),
+        'errors': int(counts.get('Errors', 0)),
+        'p50_ms': percentile(latencies, 50),
+        'p99_ms': percentile(latencies, 99),
+        'peak_rss_mb': peak_rss_mb(),
+    }))
+
+def spawn_scenario(root, import_args):
+    """Run one scenario in a fresh interpreter and return its measurements"""
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '_run', root, f'--import-args={shlex.join(import_args)}'],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        raise SystemExit(f"❌ Scenario failed in {root} (exit {result.returncode})")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def git_commit():
+    """Current commit of the checkout the importer lives in, if any"""
+    try:
+        return subprocess.run(['git', '-C', HERE, 'rev-parse', '--short', 'HEAD'],
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def bench_corpus(count, args, import_args):
+    """Generate one corpus and time cold, warm and incremental imports over it"""
+    root = tempfile.mkdtemp(prefix=f"research-bench-{count}-", dir=args.tmpdir)
+    try:
+        memory_dir = os.path.join(root, "memory")
+        print(f"📝 Generating {count:,} files…", flush=True)
+        total_bytes = generate_corpus(memory_dir, count, args.median_kb, args.sigma, args.dup_ratio, args.seed)
+
+        conn = sqlite3.connect(os.path.join(root, "remy.db"))
+        conn.execute(ARTIFACTS_SCHEMA)
+        conn.commit()
+        conn.close()
+
+        scenarios = {}
+        for name in ('cold', 'warm', 'incremental'):
+            if name == 'incremental':
+                touch_corpus(memory_dir, 0.01, args.seed + 1)
+            result = spawn_scenario(root, import_args)
+            result['files_per_sec'] = round(count / result['seconds'], 1) if result['seconds'] else None
+            scenarios[name] = result
+            print(f"   {name:12} {result['seconds']:>9.3f}s  {result['files_per_sec'] or 0:>10,.0f} files/s"
+                  f"  p50 {result['p50_ms'] or 0:>7.3f} ms  p99 {result['p99_ms'] or 0:>8.3f} ms"
+                  f"  rss {result['peak_rss_mb']:>6.1f} MB", flush=True)
+
+        return {
+            'files': count,
+            'bytes': total_bytes,
+            'db_bytes': os.path.getsize(os.path.join(root, "remy.db")),
+            'scenarios': scenarios,
+        }
+    finally:
+        if not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Benchmark research-import.py on synthetic corpora")
+    parser.add_argument('--sizes', default="1000,10000,100000",
+                        help="comma-separated corpus sizes (default: 1000,10000,100000)")
+    parser.add_argument('--median-kb', type=float, default=6.0,
+                        help="median file size in KB (default: 6)")
+    parser.add_argument('--sigma', type=float, default=0.8,
+                        help="log-normal spread of file sizes (default: 0.8)")
+    parser.add_argument('--dup-ratio', type=float, default=0.05,
+                        help="fraction of files that are exact duplicates (default: 0.05)")
+    parser.add_argument('--seed', type=int, default=42, help="corpus RNG seed (default: 42)")
+    parser.add_argument('--import-args', default="--bulk",
+                        help="arguments passed to research-import.py (default: '--bulk')")
+    parser.add_argument('--output', help="write results JSON here (default: stdout)")
+    parser.add_argument('--tmpdir', help="where to generate corpora (default: system temp)")
+    parser.add_argument('--keep', action='store_true', help="keep generated corpora and DBs")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ['_run']:
+        run_parser = argparse.ArgumentParser()
+        run_parser.add_argument('root')
+        run_parser.add_argument('--import-args', default="")
+        run_args = run_parser.parse_args(argv[1:])
+        run_scenario(run_args.root, shlex.split(run_args.import_args))
+        return
+
+    args = parse_args(argv)
+    import_args = shlex.split(args.import_args)
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+
+    print("⏱️  Research import benchmark")
+    print(f"   importer args: {' '.join(import_args) or '(none)'}")
+    print("=" * 50)
+
+    corpora = []
+    for count in sizes:
+        corpora.append(bench_corpus(count, args, import_args))
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'import_args': import_args,
+        'corpus': {
+            'median_kb': args.median_kb,
+            'sigma': args.sigma,
+            'dup_ratio': args.dup_ratio,
+            'seed': args.seed,
+        },
+        'corpora': corpora,
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+        print(f"\n💾 Results written to {args.output}")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
@@ -21,12 +21,26 @@ echo ""
 # Create log if missing
 touch "$IMPORTED_LOG"
 
-# Function to generate artifact number
-generate_number() {
-    local count=$(sqlite3 "$DB_PATH" "SELECT COUNT(*) FROM artifacts" 2>/dev/null || echo "0")
-    local next=$((count + 1))
-    printf "DOC-%03d" $next
-}
+# Artifact numbers come from the same sequence as research-import.py:
+# caught up with DOC numbers in rows past the 'artifacts_scanned' id,
+# then incremented, in the same transaction as the insert
+ALLOCATE_NUMBER_SQL="
+    CREATE TABLE IF NOT EXISTS artifact_sequence (
+        name TEXT PRIMARY KEY,
+        value INTEGER NOT NULL
+    );
+    INSERT OR IGNORE INTO artifact_sequence (name, value) VALUES ('artifacts', 0);
+    UPDATE artifact_sequence
+    SET value = MAX(value, (
+        SELECT COALESCE(MAX(CAST(SUBSTR(artifact_number, 5) AS INTEGER)), 0)
+        FROM artifacts
+        WHERE id > COALESCE((SELECT value FROM artifact_sequence WHERE name = 'artifacts_scanned'), 0)
+          AND artifact_number LIKE 'DOC-%'
+    )) + 1
+    WHERE name = 'artifacts';
+    INSERT OR REPLACE INTO artifact_sequence (name, value)
+    SELECT 'artifacts_scanned', COALESCE(MAX(id), 0) FROM artifacts;
+"
 
 # Function to calculate content hash (simple MD5)
 calculate_hash() {
@@ -73,27 +87,37 @@ find "$MEMORY_DIR" -maxdepth 1 -name "RESEARCH-*.md" -type f | sort | while read
         continue
     fi
     
-    # Generate artifact number
-    artifact_number=$(generate_number)
-    
     # Read content (escape single quotes)
     content=$(cat "$filepath" | sed "s/'/''/g")
     
-    # Insert into database
-    result=$(sqlite3 "$DB_PATH" "
+    # Reserve the artifact number and insert in one transaction
+    error=""
+    result=$(sqlite3 -bail -separator ' ' "$DB_PATH" "
+        BEGIN IMMEDIATE;
+        $ALLOCATE_NUMBER_SQL
         INSERT INTO artifacts 
             (artifact_number, title, description, file_name, file_size, mime_type, content_hash, content, created_by, created_at)
         VALUES 
-            ('$artifact_number', '$(echo "$title" | sed "s/'/''/g")', '$(echo "$description" | sed "s/'/''/g")', '$filename', $file_size, 'text/markdown', '$content_hash', '$(echo "$content" | sed "s/'/''/g")', 'research-import', datetime('now'));
-        SELECT last_insert_rowid();
-    " 2>&1) || result=""
+            ((SELECT printf('DOC-%03d', value) FROM artifact_sequence WHERE name = 'artifacts'), '$(echo "$title" | sed "s/'/''/g")', '$(echo "$description" | sed "s/'/''/g")', '$filename', $file_size, 'text/markdown', '$content_hash', '$(echo "$content" | sed "s/'/''/g")', 'research-import', datetime('now'));
+        COMMIT;
+        SELECT artifact_number, id FROM artifacts WHERE id = last_insert_rowid();
+    " 2>&1) || { error="$result"; result=""; }
+    
+    # The search index view decodes content with a function only
+    # research-import.py registers; say so instead of a raw SQL error
+    if [[ "$error" == *"artifact_content"* ]]; then
+        echo -e "${YELLOW}❌ Error:${NC} $filename needs artifact_content(), which only research-import.py provides" >&2
+        echo "   Run backlog/research-import.py instead (or search with: research-import.py search)" >&2
+        exit 1
+    fi
     
     if [ -n "$result" ] && [ "$result" != "" ]; then
+        read -r artifact_number artifact_id <<< "$result"
         echo "$filename" >> "$IMPORTED_LOG"
-        echo -e "${GREEN}✅ Imported:${NC} $filename → $artifact_number (ID: $result)"
+        echo -e "${GREEN}✅ Imported:${NC} $filename → $artifact_number (ID: $artifact_id)"
         ((import_count++)) || true
     else
-        echo -e "${YELLOW}❌ Error:${NC} Failed to import $filename"
+        echo -e "${YELLOW}❌ Error:${NC} Failed to import $filename${error:+ - $error}"
         ((error_count++)) || true
     fi
 done
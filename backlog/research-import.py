@@ -4,121 +4,1006 @@ research-import.py - Import RESEARCH-* files to Documentation Hub
 """
 
 import os
+import sys
+import ctypes
+import ctypes.util
+import select
 import sqlite3
 import hashlib
-import glob
+import time
+import json
+import zlib
+import cProfile
+import pstats
+import struct
+import argparse
+from functools import partial
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
-MEMORY_DIR = os.path.expanduser("~/.openclaw/workspace/memory")
-DB_PATH = os.path.expanduser("~/projects/remy-tracker/remy.db")
-IMPORTED_LOG = os.path.expanduser("~/.openclaw/workspace/backlog/research-imported.log")
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
-def get_content_hash(filepath):
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+import workspace_config
+
+MEMORY_DIR = workspace_config.path("memory")
+DB_PATH = os.path.expanduser(workspace_config.get("REMY_DB", "~/projects/remy-tracker/remy.db"))
+IMPORTED_LOG = workspace_config.path("backlog", "research-imported.log")
+
+# Rows staged per transaction in --bulk mode
+BULK_BATCH_SIZE = 1000
+
+# Files handed to the worker pool at a time (per worker), bounding how far
+# readers can run ahead of the SQLite writer
+WORKER_WINDOW = 64
+
+# Stored content encodings; plain text rows keep content_encoding NULL
+CONTENT_ENCODINGS = ('zlib', 'zstd')
+
+# --watch: quiet period before a burst of writes is imported, and the
+# polling interval used when inotify is unavailable
+WATCH_DEBOUNCE = 2.0
+WATCH_POLL_INTERVAL = 5.0
+
+# inotify(7) event masks and struct inotify_event header
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+_INOTIFY_EVENT = struct.Struct('iIII')
+
+# Counters reported by --metrics-json / --prometheus-textfile
+METRIC_COUNTERS = {
+    'files_scanned': "RESEARCH-*.md files considered",
+    'files_unchanged': "files skipped on their stat key alone",
+    'files_read': "files read from disk",
+    'bytes_read': "bytes read from research files",
+    'rows_inserted': "artifact rows inserted",
+    'duplicate_hits': "files skipped as exact duplicates",
+    'near_duplicate_hits': "files flagged as near-duplicates",
+    'unchanged_content': "touched files whose content hash was unchanged",
+    'errors': "files or batches that failed",
+    'batches_committed': "transactions committed",
+    'batches_rolled_back': "transactions rolled back",
+}
+COMMIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+class ImportMetrics:
+    """Cumulative per-stage timers, counters and a commit latency histogram"""
+    
+    def __init__(self):
+        self.started = time.time()
+        self.stages = {}
+        self.counters = dict.fromkeys(METRIC_COUNTERS, 0)
+        self.commit_buckets = [0] * len(COMMIT_BUCKETS)
+        self.commit_count = 0
+        self.commit_sum = 0.0
+    
+    @contextmanager
+    def stage(self, name):
+        """Time the enclosed block under `name`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            totals = self.stages.setdefault(name, [0.0, 0])
+            totals[0] += time.perf_counter() - start
+            totals[1] += 1
+    
+    def timed(self, iterable, name):
+        """Yield from `iterable`, charging the time spent waiting for each item to `name`"""
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+    
+    def count(self, name, n=1):
+        self.counters[name] += n
+    
+    def observe_commit(self, seconds):
+        self.commit_count += 1
+        self.commit_sum += seconds
+        for i, bound in enumerate(COMMIT_BUCKETS):
+            if seconds <= bound:
+                self.commit_buckets[i] += 1
+        totals = self.stages.setdefault('commit', [0.0, 0])
+        totals[0] += seconds
+        totals[1] += 1
+    
+    def as_dict(self):
+        return {
+            'started': self.started,
+            'elapsed_seconds': round(time.time() - self.started, 6),
+            'stages': {
+                name: {'seconds': round(seconds, 6), 'calls': calls}
+                for name, (seconds, calls) in self.stages.items()
+            },
+            'counters': dict(self.counters),
+            'commit_latency': {
+                'count': self.commit_count,
+                'sum_seconds': round(self.commit_sum, 6),
+                'buckets': {str(bound): n for bound, n in zip(COMMIT_BUCKETS, self.commit_buckets)},
+            },
+        }
+    
+    def to_prometheus(self):
+        """Render in the Prometheus text exposition format"""
+        lines = [
+            "# HELP research_import_stage_seconds_total Cumulative wall time per import stage.",
+            "# TYPE research_import_stage_seconds_total counter",
+        ]
+        lines += [f'research_import_stage_seconds_total{{stage="{name}"}} {seconds:.6f}'
+                  for name, (seconds, _) in sorted(self.stages.items())]
+        for name, help_text in METRIC_COUNTERS.items():
+            lines += [
+                f"# HELP research_import_{name}_total Number of {help_text}.",
+                f"# TYPE research_import_{name}_total counter",
+                f"research_import_{name}_total {self.counters[name]}",
+            ]
+        lines += [
+            "# HELP research_import_commit_seconds Commit latency.",
+            "# TYPE research_import_commit_seconds histogram",
+        ]
+        lines += [f'research_import_commit_seconds_bucket{{le="{bound}"}} {n}'
+                  for bound, n in zip(COMMIT_BUCKETS, self.commit_buckets)]
+        lines += [
+            f'research_import_commit_seconds_bucket{{le="+Inf"}} {self.commit_count}',
+            f"research_import_commit_seconds_sum {self.commit_sum:.6f}",
+            f"research_import_commit_seconds_count {self.commit_count}",
+            "# HELP research_import_last_update_timestamp_seconds When these metrics were written.",
+            "# TYPE research_import_last_update_timestamp_seconds gauge",
+            f"research_import_last_update_timestamp_seconds {time.time():.3f}",
+        ]
+        return '\n'.join(lines) + '\n'
+
+METRICS = ImportMetrics()
+
+# Near-duplicate detection: MinHash over word shingles, banded for LSH.
+# 32 bands x 4 rows only proposes candidates (recall is ~87% already at
+# Jaccard 0.5); the configurable threshold is applied to the full
+# signature, so changing it never invalidates the stored buckets.
+SHINGLE_WORDS = 5
+LSH_BANDS = 32
+LSH_ROWS = 4
+MINHASH_PERMUTATIONS = LSH_BANDS * LSH_ROWS
+NEAR_DUP_THRESHOLD = 0.85
+# Shingle hashes are built from per-word CRC-32s in NumPy, and the
+# permutations are multiply-shift hashes ((a * h + b) mod 2**64) >> 32 of
+# them. Bump MINHASH_VERSION when the scheme changes: stored signatures
+# are then dropped and backfilled.
+MINHASH_VERSION = 2
+MINHASH_CHUNK = 4096
+_MINHASH_PARAMS = struct.unpack(f'<{2 * MINHASH_PERMUTATIONS + SHINGLE_WORDS}Q', hashlib.shake_128(
+    b'research-import minhash').digest(8 * (2 * MINHASH_PERMUTATIONS + SHINGLE_WORDS)))
+if np is not None:
+    _MINHASH_A = np.array(_MINHASH_PARAMS[:MINHASH_PERMUTATIONS], dtype=np.uint64) | np.uint64(1)
+    _MINHASH_B = np.array(_MINHASH_PARAMS[MINHASH_PERMUTATIONS:2 * MINHASH_PERMUTATIONS], dtype=np.uint64)
+    _SHINGLE_WEIGHTS = np.array(_MINHASH_PARAMS[2 * MINHASH_PERMUTATIONS:], dtype=np.uint64) | np.uint64(1)
+
+INSERT_ARTIFACT_SQL = """
+    INSERT INTO artifacts 
+        (artifact_number, title, description, file_name, file_size, mime_type, 
+         content_hash, content, content_encoding, created_by, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
+"""
+
+UPSERT_MANIFEST_SQL = """
+    INSERT OR REPLACE INTO research_manifest
+        (file_name, size, mtime_ns, inode, content_hash, artifact_number, revision)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Catches the sequence up with DOC numbers inserted by other writers, looking
+# only at rows past the 'artifacts_scanned' high-water id (a rowid range
+# search, so a reservation doesn't scan the whole table)
+RESERVE_NUMBERS_SQL = """
+    UPDATE artifact_sequence
+    SET value = MAX(value, (
+        SELECT COALESCE(MAX(CAST(SUBSTR(artifact_number, 5) AS INTEGER)), 0)
+        FROM artifacts
+        WHERE id > COALESCE((SELECT value FROM artifact_sequence WHERE name = 'artifacts_scanned'), 0)
+          AND artifact_number LIKE 'DOC-%'
+    )) + ?
+    WHERE name = 'artifacts'
+    RETURNING value
+"""
+
+MARK_SCANNED_SQL = """
+    INSERT OR REPLACE INTO artifact_sequence (name, value)
+    SELECT 'artifacts_scanned', COALESCE(MAX(id), 0) FROM artifacts
+"""
+
+def get_content_hash(data):
     """Calculate MD5 hash of file content"""
-    with open(filepath, 'rb') as f:
-        return hashlib.md5(f.read()).hexdigest()
+    return hashlib.md5(data).hexdigest()
+
+def encode_content(content, encoding):
+    """Encode markdown for storage: text as-is, or a zlib/zstd blob"""
+    if encoding is None:
+        return content
+    data = content.encode('utf-8')
+    if encoding == 'zlib':
+        return zlib.compress(data, 9)
+    if encoding == 'zstd':
+        return zstandard.ZstdCompressor(level=19).compress(data)
+    raise ValueError(f"unknown content encoding: {encoding}")
+
+def read_artifact_content(content, encoding):
+    """Return an artifact's markdown, decompressing it if stored as a blob"""
+    if encoding is None or content is None:
+        return content
+    if encoding == 'zlib':
+        return zlib.decompress(content).decode('utf-8')
+    if encoding == 'zstd':
+        return zstandard.ZstdDecompressor().decompress(content).decode('utf-8')
+    raise ValueError(f"unknown content encoding: {encoding}")
+
+def minhash_signature(content):
+    """MinHash signature (MINHASH_PERMUTATIONS 32-bit ints) of the content's word shingles.
+
+    Each word is hashed once (CRC-32); a shingle's hash is a weighted sum
+    of its SHINGLE_WORDS word hashes, and all permutations are one
+    multiply-shift over a permutations x shingles uint64 array followed
+    by a row-wise minimum (in MINHASH_CHUNK-shingle slices, so memory stays
+    bounded on large files). Duplicate shingles don't change a minimum, so
+    they are not removed. Needs NumPy (checked in parse_args for --near-dups).
+    """
+    words = content.lower().split() or ['']
+    word_hashes = np.fromiter(map(zlib.crc32, map(str.encode, words)), dtype=np.uint64, count=len(words))
+    count = max(1, len(words) - SHINGLE_WORDS + 1)
+    shingles = np.zeros(count, dtype=np.uint64)
+    for k, weight in enumerate(_SHINGLE_WEIGHTS[:len(words)]):
+        shingles += word_hashes[k:k + count] * weight
+    shingles >>= np.uint64(32)
+    signature = None
+    for start in range(0, count, MINHASH_CHUNK):
+        permuted = np.multiply.outer(_MINHASH_A, shingles[start:start + MINHASH_CHUNK])
+        permuted += _MINHASH_B[:, None]
+        permuted >>= np.uint64(32)
+        lowest = permuted.min(axis=1)
+        signature = lowest if signature is None else np.minimum(signature, lowest)
+    return tuple(signature.tolist())
 
-def get_next_artifact_number(conn):
-    """Generate next artifact number"""
-    cursor = conn.execute("SELECT COUNT(*) FROM artifacts")
-    count = cursor.fetchone()[0]
-    return f"DOC-{count + 1:03d}"
+def lsh_buckets(signature):
+    """Yield (band, bucket) keys for a signature"""
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        digest = hashlib.blake2b(struct.pack(f'<{LSH_ROWS}I', *rows), digest_size=8).digest()
+        yield band, int.from_bytes(digest, 'little', signed=True)
 
-def extract_title(filepath):
+def estimate_jaccard(sig_a, sig_b):
+    """Estimated Jaccard similarity of two MinHash signatures"""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+def find_near_duplicate(conn, signature, threshold):
+    """Return (artifact_number, similarity) of the closest indexed artifact at or above threshold.
+
+    Only artifacts sharing at least one LSH bucket are compared, and each
+    bucket is a primary-key search on artifact_lsh, so the cost depends on
+    the number of similar documents, not the table size.
+    """
+    buckets = list(lsh_buckets(signature))
+    candidates = conn.execute(f"""
+        WITH probe (band, bucket) AS (VALUES {', '.join(['(?, ?)'] * len(buckets))})
+        SELECT DISTINCT m.artifact_number, m.signature
+        FROM probe
+        JOIN artifact_lsh l ON l.band = probe.band AND l.bucket = probe.bucket
+        JOIN artifact_minhash m ON m.artifact_number = l.artifact_number
+    """, [value for bucket in buckets for value in bucket]).fetchall()
+    best = None
+    for artifact_number, blob in candidates:
+        similarity = estimate_jaccard(signature, struct.unpack(f'<{MINHASH_PERMUTATIONS}I', blob))
+        if similarity >= threshold and (best is None or similarity > best[1]):
+            best = (artifact_number, similarity)
+    return best
+
+def index_signatures(conn, signatures):
+    """Store (artifact_number, signature) pairs in the MinHash table and LSH buckets"""
+    conn.executemany("INSERT OR REPLACE INTO artifact_minhash (artifact_number, signature) VALUES (?, ?)", [
+        (number, struct.pack(f'<{MINHASH_PERMUTATIONS}I', *signature)) for number, signature in signatures
+    ])
+    conn.executemany("INSERT OR IGNORE INTO artifact_lsh (band, bucket, artifact_number) VALUES (?, ?, ?)", [
+        (band, bucket, number) for number, signature in signatures for band, bucket in lsh_buckets(signature)
+    ])
+
+def backfill_signatures(conn):
+    """Add MinHash signatures for artifacts imported before near-duplicate detection was on"""
+    cursor = conn.execute("""
+        SELECT artifact_number, content, content_encoding FROM artifacts
+        WHERE artifact_number NOT IN (SELECT artifact_number FROM artifact_minhash)
+          AND content IS NOT NULL
+    """)
+    count = 0
+    while True:
+        rows = cursor.fetchmany(500)
+        if not rows:
+            break
+        with conn:
+            index_signatures(conn, [
+                (number, minhash_signature(read_artifact_content(content, encoding)))
+                for number, content, encoding in rows
+            ])
+        count += len(rows)
+    return count
+
+def connect_db():
+    """Open the Documentation Hub DB with the importer's SQL helpers registered"""
+    conn = sqlite3.connect(DB_PATH)
+    conn.create_function('artifact_content', 2, read_artifact_content, deterministic=True)
+    return conn
+
+def ensure_schema(conn):
+    """Create the importer's columns, tables and indexes if missing"""
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(artifacts)")]
+    if 'content_encoding' not in columns:
+        conn.execute("ALTER TABLE artifacts ADD COLUMN content_encoding TEXT")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_artifacts_content_hash ON artifacts(content_hash)")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS artifact_sequence (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        )
+    """)
+    # Stat manifest: lets a run skip unchanged files without reading them
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS research_manifest (
+            file_name TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            inode INTEGER NOT NULL,
+            content_hash TEXT NOT NULL,
+            artifact_number TEXT,
+            revision INTEGER NOT NULL DEFAULT 1
+        )
+    """)
+    # Seed from the highest existing DOC number; reservations also move it
+    # past any number inserted since (rows after the 'artifacts_scanned'
+    # id), and it never goes back, so deleted numbers are never reused
+    conn.execute("""
+        INSERT OR IGNORE INTO artifact_sequence (name, value)
+        SELECT 'artifacts', COALESCE(MAX(CAST(SUBSTR(artifact_number, 5) AS INTEGER)), 0)
+        FROM artifacts WHERE artifact_number LIKE 'DOC-%'
+          AND NOT EXISTS (SELECT 1 FROM artifact_sequence WHERE name = 'artifacts')
+    """)
+    # MinHash signatures and LSH buckets for near-duplicate detection
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS artifact_minhash (
+            artifact_number TEXT PRIMARY KEY,
+            signature BLOB NOT NULL
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS artifact_lsh (
+            band INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            artifact_number TEXT NOT NULL,
+            PRIMARY KEY (band, bucket, artifact_number)
+        ) WITHOUT ROWID
+    """)
+    # Signatures from an older MinHash scheme can't be compared with new
+    # ones; drop them so --near-dups backfills them
+    row = conn.execute("SELECT value FROM artifact_sequence WHERE name = 'minhash_version'").fetchone()
+    if (row[0] if row else 1) != MINHASH_VERSION:
+        conn.execute("DELETE FROM artifact_minhash")
+        conn.execute("DELETE FROM artifact_lsh")
+        conn.execute("INSERT OR REPLACE INTO artifact_sequence (name, value) VALUES ('minhash_version', ?)",
+                     (MINHASH_VERSION,))
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS artifact_near_duplicates (
+            artifact_number TEXT PRIMARY KEY,
+            duplicate_of TEXT NOT NULL,
+            similarity REAL NOT NULL
+        )
+    """)
+    # Full-text index over title + decoded content, rowid = artifacts.id.
+    # External content: FTS5 reads column text back through the
+    # artifacts_search view instead of storing its own uncompressed copy.
+    # The view calls artifact_content(), a Python function registered by
+    # connect_db(), so other clients of the DB (sqlite3 CLI, the Hub API,
+    # research-import-db.sh) can MATCH and rank (rowid, bm25) but get
+    # "no such function: artifact_content" from snippet()/highlight(), a
+    # SELECT of the indexed columns or an FTS 'rebuild'; use
+    # `research-import.py search [--rebuild]` for those
+    conn.execute("""
+        CREATE VIEW IF NOT EXISTS artifacts_search AS
+        SELECT id, title, artifact_content(content, content_encoding) AS content
+        FROM artifacts
+    """)
+    row = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'artifacts_fts'").fetchone()
+    if row and 'content_rowid' not in row[0]:
+        # Index from before external content, holding a full copy of the text
+        conn.execute("DROP TABLE artifacts_fts")
+        row = None
+    if not row:
+        conn.execute("""
+            CREATE VIRTUAL TABLE artifacts_fts
+            USING fts5(title, content, content = 'artifacts_search', content_rowid = 'id',
+                       tokenize = 'porter unicode61')
+        """)
+        conn.execute("DELETE FROM artifact_sequence WHERE name = 'artifacts_fts'")
+        index_new_artifacts(conn)
+    conn.commit()
+
+def index_new_artifacts(conn):
+    """Add artifacts newer than the last indexed id to the search index.
+
+    Called inside the insert transaction, so the index stays in step with
+    the artifacts table; also picks up rows written by other tools. The
+    last indexed id is kept in artifact_sequence as 'artifacts_fts' (an
+    external-content index can't report its own highest rowid).
+    """
+    row = conn.execute("SELECT value FROM artifact_sequence WHERE name = 'artifacts_fts'").fetchone()
+    conn.execute("""
+        INSERT INTO artifacts_fts (rowid, title, content)
+        SELECT id, title, content FROM artifacts_search WHERE id > ? ORDER BY id
+    """, (row[0] if row else 0,))
+    mark_indexed(conn)
+
+def mark_indexed(conn):
+    """Record every current artifact as indexed"""
+    conn.execute("""
+        INSERT OR REPLACE INTO artifact_sequence (name, value)
+        SELECT 'artifacts_fts', COALESCE(MAX(id), 0) FROM artifacts
+    """)
+
+def rebuild_search_index(conn):
+    """Rebuild the search index from the artifacts table and merge its segments"""
+    with conn:
+        conn.execute("INSERT INTO artifacts_fts (artifacts_fts) VALUES ('rebuild')")
+        mark_indexed(conn)
+        conn.execute("INSERT INTO artifacts_fts (artifacts_fts) VALUES ('optimize')")
+    return conn.execute("SELECT COUNT(*) FROM artifacts").fetchone()[0]
+
+def search_artifacts(conn, query, limit=10):
+    """Return ranked (artifact_number, title, file_name, score, snippet) hits for an FTS5 query.
+
+    Titles weigh ten times as much as body text. Queries that are not
+    valid FTS5 syntax (e.g. 'x-api') are retried as plain quoted terms.
+    """
+    sql = """
+        SELECT a.artifact_number, a.title, a.file_name,
+               bm25(artifacts_fts, 10.0, 1.0) AS score,
+               snippet(artifacts_fts, 1, '[', ']', '…', 16)
+        FROM artifacts_fts
+        JOIN artifacts a ON a.id = artifacts_fts.rowid
+        WHERE artifacts_fts MATCH ?
+        ORDER BY score
+        LIMIT ?
+    """
+    try:
+        return conn.execute(sql, (query, limit)).fetchall()
+    except sqlite3.OperationalError:
+        quoted = ' '.join('"' + term.replace('"', '""') + '"' for term in query.split())
+        return conn.execute(sql, (quoted, limit)).fetchall()
+
+def reserve_artifact_numbers(conn, count):
+    """Reserve a block of `count` consecutive artifact numbers.
+
+    Runs inside the caller's write transaction, so concurrent imports
+    serialize on the sequence row and never hand out the same number.
+    The sequence is first moved past the highest DOC number inserted since
+    the last reservation, so artifacts from other writers (the Hub API,
+    research-import-db.sh) never collide with the block.
+    """
+    cursor = conn.execute(RESERVE_NUMBERS_SQL, (count,))
+    last = cursor.fetchone()[0]
+    conn.execute(MARK_SCANNED_SQL)
+    return [f"DOC-{n:03d}" for n in range(last - count + 1, last + 1)]
+
+def load_manifest(conn):
+    """Load the manifest as file_name -> (size, mtime_ns, inode, content_hash, artifact_number, revision)"""
+    cursor = conn.execute("""
+        SELECT file_name, size, mtime_ns, inode, content_hash, artifact_number, revision
+        FROM research_manifest
+    """)
+    return {row[0]: row[1:] for row in cursor}
+
+def is_research_file(filename):
+    """True for RESEARCH-*.md names"""
+    return filename.startswith('RESEARCH-') and filename.endswith('.md')
+
+def stat_key(st):
+    """Manifest key for a stat result"""
+    return (st.st_size, st.st_mtime_ns, st.st_ino)
+
+def scan_research_files(memory_dir):
+    """List (filename, filepath, stat) for RESEARCH-*.md files, sorted by name"""
+    if not os.path.isdir(memory_dir):
+        return []
+    files = []
+    with METRICS.stage('scan'), os.scandir(memory_dir) as entries:
+        for entry in entries:
+            if is_research_file(entry.name) and entry.is_file():
+                files.append((entry.name, entry.path, entry.stat()))
+        files.sort()
+    return files
+
+def stat_research_files(memory_dir, filenames):
+    """Like scan_research_files(), for just `filenames`; missing files are dropped"""
+    files = []
+    for filename in sorted(filenames):
+        filepath = os.path.join(memory_dir, filename)
+        try:
+            files.append((filename, filepath, os.stat(filepath)))
+        except FileNotFoundError:
+            pass
+    return files
+
+def extract_title(content, filename):
     """Extract title from first H1 in markdown"""
+    for line in content.splitlines():
+        if line.startswith('# '):
+            return line[2:].strip()
+    return filename
+
+def extract_date(filename):
+    """Extract the report date from the filename (default to today)"""
+    date_str = datetime.now().strftime('%Y-%m-%d')
+    parts = filename.replace('RESEARCH-', '').replace('.md', '').split('-')
+    if len(parts) >= 3:
+        date_str = f"{parts[-3]}-{parts[-2]}-{parts[-1]}"
+    return date_str
+
+def read_research_file(filepath):
+    """Read a research file once and derive everything the import needs from that buffer.
+
+    Returns (file_size, content_hash, content, title, date_str).
+    """
+    filename = os.path.basename(filepath)
+    with open(filepath, 'rb') as f:
+        data = f.read()
+    content = data.decode('utf-8')
+    return len(data), get_content_hash(data), content, extract_title(content, filename), extract_date(filename)
+
+def prepare_research_file(filepath, near_dups=False):
+    """Worker entry point: returns (parsed, signature, error) so one bad file never aborts the pool"""
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            for line in f:
-                if line.startswith('# '):
-                    return line[2:].strip()
-    except:
-        pass
-    return os.path.basename(filepath)
+        parsed = read_research_file(filepath)
+    except (OSError, UnicodeDecodeError) as e:
+        return None, None, e
+    return parsed, minhash_signature(parsed[2]) if near_dups else None, None
 
-def main():
-    print("📚 Research Import to Documentation Hub")
-    print("=" * 50)
+def iter_prepared(filepaths, workers, near_dups=False):
+    """Yield prepare_research_file() results in input order.
+
+    With more than one worker, files are read, hashed and parsed on a
+    process pool; results still come back in order, so the single writer
+    assigns the same DOC numbers whatever the worker count.
+    """
+    prepare = partial(prepare_research_file, near_dups=near_dups)
+    # A handful of files (e.g. one --watch burst) is not worth a pool
+    if workers <= 1 or len(filepaths) < workers * 4:
+        yield from map(prepare, filepaths)
+        return
+    window = workers * WORKER_WINDOW
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for start in range(0, len(filepaths), window):
+            chunk = filepaths[start:start + window]
+            yield from pool.map(prepare, chunk, chunksize=max(1, len(chunk) // (workers * 4)))
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Import RESEARCH-* files to Documentation Hub")
+    parser.add_argument('--bulk', action='store_true',
+                        help="stage new rows and load them in large transactions (WAL journal)")
+    parser.add_argument('--batch-size', type=int, default=BULK_BATCH_SIZE,
+                        help=f"rows per transaction in --bulk mode (default: {BULK_BATCH_SIZE})")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="processes reading, hashing and parsing files (default: 1, in-process)")
+    parser.add_argument('--compress', choices=CONTENT_ENCODINGS,
+                        help="store new artifact content as a compressed blob")
+    parser.add_argument('--near-dups', action='store_true',
+                        help="detect near-duplicates with MinHash/LSH (needs NumPy; "
+                             "signatures cost ~1 ms per 10 KB file)")
+    parser.add_argument('--near-dup-threshold', type=float, default=NEAR_DUP_THRESHOLD,
+                        help=f"estimated Jaccard similarity that counts as a near-duplicate (default: {NEAR_DUP_THRESHOLD})")
+    parser.add_argument('--near-dup-action', choices=('link', 'skip'), default='link',
+                        help="import near-duplicates and link them to the original, or skip them (default: link)")
+    parser.add_argument('--watch', action='store_true',
+                        help="keep running and import new or changed files as they appear")
+    parser.add_argument('--debounce', type=float, default=WATCH_DEBOUNCE,
+                        help=f"--watch: seconds of quiet before a burst is imported (default: {WATCH_DEBOUNCE})")
+    parser.add_argument('--poll-interval', type=float, default=WATCH_POLL_INTERVAL,
+                        help=f"--watch: rescan interval when inotify is unavailable (default: {WATCH_POLL_INTERVAL})")
+    parser.add_argument('--metrics-json', metavar='PATH',
+                        help="write per-stage timings and counters as JSON ('-' for stdout)")
+    parser.add_argument('--prometheus-textfile', metavar='PATH',
+                        help="write metrics for the node_exporter textfile collector")
+    parser.add_argument('--profile', metavar='PATH',
+                        help="run under cProfile and write stats sorted by cumulative time")
+    
+    subparsers = parser.add_subparsers(dest='command')
+    search = subparsers.add_parser('search', help="full-text search imported artifacts")
+    search.add_argument('query', nargs='?', help="FTS5 query, e.g. 'rate limit' or 'title:stripe'")
+    search.add_argument('--limit', type=int, default=10, help="maximum hits to show (default: 10)")
+    search.add_argument('--rebuild', action='store_true',
+                        help="rebuild the index from the artifacts table before searching")
+    
+    compress = subparsers.add_parser('compress', help="convert stored content to another encoding in place")
+    compress.add_argument('--encoding', choices=CONTENT_ENCODINGS + ('none',), default='zlib',
+                          help="target encoding; 'none' restores plain text (default: zlib)")
+    compress.add_argument('--batch-size', type=int, default=500,
+                          help="rows converted per transaction (default: 500)")
+    compress.add_argument('--vacuum', action='store_true',
+                          help="VACUUM afterwards so the DB file actually shrinks")
+    
+    args = parser.parse_args(argv)
+    if args.command == 'search' and not args.query and not args.rebuild:
+        parser.error("search needs a query or --rebuild")
+    for encoding in (args.compress, getattr(args, 'encoding', None)):
+        if encoding == 'zstd' and zstandard is None:
+            parser.error("zstd encoding needs the zstandard package (pip install zstandard)")
+    if getattr(args, 'near_dups', False) and np is None:
+        parser.error("--near-dups needs NumPy (pip install numpy)")
+    return args
+
+def append_imported_log(filenames, sync=False):
+    """Append filenames to the imported log in a single write (fsynced if `sync`)"""
+    if not filenames:
+        return
+    with METRICS.stage('log_append'), open(IMPORTED_LOG, 'a') as f:
+        f.write(''.join(name + '\n' for name in filenames))
+        if sync:
+            f.flush()
+            os.fsync(f.fileno())
+
+def flush_batch(conn, staged, manifest_rows, logged, sync_log=False):
+    """Insert staged rows and manifest updates in one transaction, then append the imported log.
+
+    `staged` holds (artifact_row, manifest_info, signature, near_dup)
+    tuples; the artifact number is reserved here and written to all of
+    them. Near-duplicate targets and manifest artifact numbers are either
+    DOC numbers or int indexes into `staged` for an original earlier in
+    the same batch. The log is only appended after the commit succeeds,
+    so a failed batch leaves the DB, the manifest and the log untouched.
+    A failed log append is reported but not fatal: the committed manifest
+    already makes a re-run skip these files.
+    Returns the manifest rows written, or None if the batch was rolled back.
+    """
+    rows = list(manifest_rows)
+    try:
+        if staged:
+            with METRICS.stage('insert'):
+                numbers = reserve_artifact_numbers(conn, len(staged))
+                rows = [
+                    row[:5] + (numbers[row[5]],) + row[6:] if isinstance(row[5], int) else row
+                    for row in rows
+                ]
+                conn.executemany(INSERT_ARTIFACT_SQL, [
+                    (number,) + entry[0] for number, entry in zip(numbers, staged)
+                ])
+                rows.extend(
+                    entry[1][:5] + (number, entry[1][5]) for number, entry in zip(numbers, staged)
+                )
+            with METRICS.stage('search_index'):
+                index_new_artifacts(conn)
+            with METRICS.stage('near_dup_index'):
+                index_signatures(conn, [
+                    (number, entry[2]) for number, entry in zip(numbers, staged) if entry[2]
+                ])
+                links = []
+                for number, (_, _, _, near_dup) in zip(numbers, staged):
+                    if near_dup:
+                        target, similarity = near_dup
+                        links.append((number, numbers[target] if isinstance(target, int) else target, similarity))
+                conn.executemany("""
+                    INSERT OR REPLACE INTO artifact_near_duplicates (artifact_number, duplicate_of, similarity)
+                    VALUES (?, ?, ?)
+                """, links)
+        with METRICS.stage('manifest'):
+            conn.executemany(UPSERT_MANIFEST_SQL, rows)
+        start = time.perf_counter()
+        conn.commit()
+        METRICS.observe_commit(time.perf_counter() - start)
+    except sqlite3.Error as e:
+        conn.rollback()
+        METRICS.count('batches_rolled_back')
+        METRICS.count('errors')
+        if staged:
+            print(f"❌ Error: batch of {len(staged)} rolled back ({staged[0][0][2]} .. {staged[-1][0][2]}) - {e}")
+        else:
+            print(f"❌ Error: manifest update rolled back - {e}")
+        return None
+    METRICS.count('batches_committed')
+    METRICS.count('rows_inserted', len(staged))
+    try:
+        append_imported_log(logged, sync_log)
+    except OSError as e:
+        METRICS.count('errors')
+        print(f"⚠️  Could not append to {IMPORTED_LOG} ({len(logged)} files already committed) - {e}")
+    return rows
+
+def measure_storage(conn):
+    """Return (file_bytes, used_bytes, content_bytes, scan_seconds) for the DB.
+
+    The scan streams every artifact through read_artifact_content(), the
+    same work any full read of the content column pays.
+    """
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    freelist = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    content_bytes = 0
+    start = time.perf_counter()
+    for content, encoding in conn.execute("SELECT content, content_encoding FROM artifacts"):
+        read_artifact_content(content, encoding)
+        if isinstance(content, str):
+            content_bytes += len(content.encode('utf-8'))
+        elif content is not None:
+            content_bytes += len(content)
+    scan_seconds = time.perf_counter() - start
+    return page_size * page_count, page_size * (page_count - freelist), content_bytes, scan_seconds
+
+def convert_content(conn, encoding, batch_size):
+    """Re-encode stored content in keyset-paged batches, one transaction each.
+
+    Only `batch_size` rows are held in memory at a time; an interrupted
+    run leaves every committed batch converted and can simply be re-run.
+    """
+    converted = 0
+    last_id = 0
+    while True:
+        rows = conn.execute("""
+            SELECT id, content, content_encoding FROM artifacts
+            WHERE id > ? AND content IS NOT NULL AND content_encoding IS NOT ?
+            ORDER BY id LIMIT ?
+        """, (last_id, encoding, batch_size)).fetchall()
+        if not rows:
+            return converted
+        with conn:
+            conn.executemany("UPDATE artifacts SET content = ?, content_encoding = ? WHERE id = ?", [
+                (encode_content(read_artifact_content(content, current), encoding), encoding, row_id)
+                for row_id, content, current in rows
+            ])
+        converted += len(rows)
+        last_id = rows[-1][0]
+        print(f"   … {converted} rows converted (through id {last_id})")
+
+def compress_main(args):
+    """Run the compress subcommand, reporting size and scan time before/after"""
+    encoding = None if args.encoding == 'none' else args.encoding
+    conn = connect_db()
+    ensure_schema(conn)
+    
+    print(f"🗜️  Converting artifact content to {args.encoding}")
+    before = measure_storage(conn)
+    converted = convert_content(conn, encoding, max(1, args.batch_size))
+    if args.vacuum:
+        conn.execute("VACUUM")
+    after = measure_storage(conn)
+    conn.close()
+    
     print()
+    print(f"📊 Converted {converted} rows")
+    print(f"   {'':12}{'before':>16}{'after':>16}")
+    for label, i, fmt in (('DB file', 0, '{:,} B'), ('DB used', 1, '{:,} B'),
+                          ('content', 2, '{:,} B'), ('full scan', 3, '{:.3f} s')):
+        print(f"   {label:12}{fmt.format(before[i]):>16}{fmt.format(after[i]):>16}")
+    if not args.vacuum:
+        print("   (run with --vacuum to return freed pages to the filesystem)")
+
+def search_main(args):
+    """Run the search subcommand"""
+    conn = connect_db()
+    ensure_schema(conn)
     
-    # Load imported log
-    imported = set()
-    if os.path.exists(IMPORTED_LOG):
-        with open(IMPORTED_LOG, 'r') as f:
-            imported = set(line.strip() for line in f if line.strip())
+    if args.rebuild:
+        start = time.perf_counter()
+        count = rebuild_search_index(conn)
+        print(f"🔎 Rebuilt search index: {count} artifacts in {time.perf_counter() - start:.2f}s")
+        if not args.query:
+            conn.close()
+            return
+        print()
     
-    # Connect to database
-    conn = sqlite3.connect(DB_PATH)
+    start = time.perf_counter()
+    hits = search_artifacts(conn, args.query, args.limit)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    conn.close()
     
-    # Find research files
-    pattern = os.path.join(MEMORY_DIR, "RESEARCH-*.md")
-    files = sorted(glob.glob(pattern))
+    print(f"🔎 {len(hits)} hits for \"{args.query}\" ({elapsed_ms:.1f} ms)")
+    for artifact_number, title, filename, score, snippet in hits:
+        print()
+        print(f"{artifact_number}  {title}  ({filename}, score {-score:.2f})")
+        print(f"   {' '.join(snippet.split())}")
+
+def load_imported_log():
+    """Load the set of filenames in the imported log"""
+    if not os.path.exists(IMPORTED_LOG):
+        return set()
+    with open(IMPORTED_LOG, 'r') as f:
+        return set(line.strip() for line in f if line.strip())
+
+def open_import_db(args):
+    """Connect and prepare the DB for an import run"""
+    os.makedirs(os.path.dirname(IMPORTED_LOG), exist_ok=True)
+    conn = connect_db()
+    if args.bulk or args.watch:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+    ensure_schema(conn)
     
+    if args.near_dups:
+        backfilled = backfill_signatures(conn)
+        if backfilled:
+            print(f"🧬 Indexed MinHash signatures for {backfilled} existing artifacts")
+    return conn
+
+def import_files(conn, files, manifest, imported, args, batch_size):
+    """Import (filename, filepath, stat) entries that are new or changed.
+
+    `manifest` and `imported` are updated in place as batches commit, so
+    a long-running caller can keep them in memory between calls.
+    Returns (imported_count, skipped_count, error_count).
+    """
     imported_count = 0
     skipped_count = 0
     error_count = 0
     
-    for filepath in files:
-        filename = os.path.basename(filepath)
-        
-        # Skip if already imported
-        if filename in imported:
+    # Rows waiting for the next commit, their content hashes, manifest
+    # updates for files that were not inserted, and new filenames to log
+    # once that commit lands
+    staged = []
+    staged_hashes = {}
+    staged_buckets = {}
+    manifest_rows = []
+    logged = []
+    
+    def flush():
+        nonlocal imported_count, error_count
+        # Batched modes fsync the log once per batch; single-file imports don't
+        rows = flush_batch(conn, staged, manifest_rows, logged, sync_log=args.bulk or args.watch)
+        if rows is None:
+            error_count += len(staged)
+        else:
+            for row in rows:
+                manifest[row[0]] = row[1:]
+            for (artifact, info, _, _), row in zip(staged, rows[len(rows) - len(staged):]):
+                revision = f" (revision {info[5]})" if info[5] > 1 else ""
+                print(f"✅ Imported: {artifact[2]} → {row[5]}{revision}")
+            imported_count += len(staged)
+            imported.update(logged)
+        staged.clear()
+        staged_hashes.clear()
+        staged_buckets.clear()
+        manifest_rows.clear()
+        logged.clear()
+    
+    # Skip unchanged files on stat alone
+    candidates = []
+    METRICS.count('files_scanned', len(files))
+    for filename, filepath, st in files:
+        file_key = stat_key(st)
+        known = manifest.get(filename)
+        if known and known[:3] == file_key:
             print(f"⏭️  Skip: {filename} (already imported)")
+            METRICS.count('files_unchanged')
             skipped_count += 1
             continue
+        candidates.append((filename, filepath, file_key, known))
+    
+    # Read once; hash, title and content all come from the same buffer
+    prepared = iter_prepared([c[1] for c in candidates], args.workers, args.near_dups)
+    for (filename, filepath, file_key, known), (parsed, signature, error) in zip(candidates, METRICS.timed(prepared, 'read_parse')):
+        if error:
+            print(f"❌ Error: {filename} - {error}")
+            METRICS.count('errors')
+            error_count += 1
+            continue
+        file_size, content_hash, content, title, date_str = parsed
+        METRICS.count('files_read')
+        METRICS.count('bytes_read', file_size)
         
-        # Extract metadata
-        title = extract_title(filepath)
-        file_size = os.path.getsize(filepath)
-        content_hash = get_content_hash(filepath)
+        revision = known[5] if known else 1
         
-        # Check for duplicate hash
-        cursor = conn.execute("SELECT id, artifact_number FROM artifacts WHERE content_hash = ? LIMIT 1", (content_hash,))
-        existing = cursor.fetchone()
-        if existing:
-            print(f"⚠️  Skip: {filename} (duplicate of {existing[1]})")
-            with open(IMPORTED_LOG, 'a') as f:
-                f.write(filename + '\n')
+        # Touched but same content: refresh the stat key only
+        if known and known[3] == content_hash:
+            print(f"⏭️  Skip: {filename} (unchanged content)")
+            METRICS.count('unchanged_content')
+            manifest_rows.append((filename,) + file_key + (content_hash, known[4], revision))
             skipped_count += 1
+            if batch_size == 1:
+                flush()
             continue
         
-        # Read content
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
+        # Check for duplicate hash (in the DB or earlier in this batch)
+        with METRICS.stage('duplicate_lookup'):
+            cursor = conn.execute("SELECT id, artifact_number FROM artifacts WHERE content_hash = ? LIMIT 1", (content_hash,))
+            existing = cursor.fetchone()
+        if existing or content_hash in staged_hashes:
+            METRICS.count('duplicate_hits')
+            original = existing[1] if existing else staged_hashes[content_hash]
+            print(f"⚠️  Skip: {filename} (duplicate of {original if existing else staged[original][0][2]})")
+            manifest_rows.append((filename,) + file_key + (content_hash, original, revision))
+            if filename not in imported:
+                logged.append(filename)
+            skipped_count += 1
+            if batch_size == 1:
+                flush()
+            continue
         
-        # Generate artifact number
-        artifact_number = get_next_artifact_number(conn)
+        # Near-duplicate of an indexed artifact or of one staged in this batch
+        near_dup = None
+        if signature:
+            with METRICS.stage('near_dup_lookup'):
+                near_dup = find_near_duplicate(conn, signature, args.near_dup_threshold)
+                for index in sorted(set(i for key in lsh_buckets(signature) for i in staged_buckets.get(key, ()))):
+                    similarity = estimate_jaccard(signature, staged[index][2])
+                    if similarity >= args.near_dup_threshold and (near_dup is None or similarity > near_dup[1]):
+                        near_dup = (index, similarity)
+        if near_dup:
+            METRICS.count('near_duplicate_hits')
+            target, similarity = near_dup
+            original = staged[target][0][2] if isinstance(target, int) else target
+            if args.near_dup_action == 'skip':
+                print(f"⚠️  Skip: {filename} (near-duplicate of {original}, ~{similarity:.0%} similar)")
+                manifest_rows.append((filename,) + file_key + (content_hash, target, revision))
+                if filename not in imported:
+                    logged.append(filename)
+                skipped_count += 1
+                if batch_size == 1:
+                    flush()
+                continue
+            print(f"🔗 Near-duplicate: {filename} ~ {original} (~{similarity:.0%} similar)")
         
-        # Extract date from filename (default to today)
-        date_str = datetime.now().strftime('%Y-%m-%d')
-        parts = filename.replace('RESEARCH-', '').replace('.md', '').split('-')
-        if len(parts) >= 3:
-            date_str = f"{parts[-3]}-{parts[-2]}-{parts[-1]}"
+        # Known files (manifest or legacy log) with new content become a new revision
+        if known or filename in imported:
+            revision += 1
         
         description = f"Research report from {date_str} - Auto-imported from memory"
+        if revision > 1:
+            description += f" (revision {revision})"
         
-        # Insert into database
-        try:
-            conn.execute("""
-                INSERT INTO artifacts 
-                    (artifact_number, title, description, file_name, file_size, mime_type, 
-                     content_hash, content, created_by, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
-            """, (
-                artifact_number, title, description, filename, file_size,
-                'text/markdown', content_hash, content, 'research-import'
-            ))
-            conn.commit()
-            
-            with open(IMPORTED_LOG, 'a') as f:
-                f.write(filename + '\n')
-            
-            print(f"✅ Imported: {filename} → {artifact_number}")
-            imported_count += 1
-            
-        except Exception as e:
-            print(f"❌ Error: {filename} - {e}")
-            error_count += 1
+        # Stage for insert; the artifact number is assigned at commit time
+        with METRICS.stage('encode'):
+            stored = encode_content(content, args.compress)
+        staged.append((
+            (title, description, filename, file_size,
+             'text/markdown', content_hash, stored, args.compress, 'research-import'),
+            (filename,) + file_key + (content_hash, revision),
+            signature,
+            near_dup
+        ))
+        staged_hashes[content_hash] = len(staged) - 1
+        if signature:
+            for key in lsh_buckets(signature):
+                staged_buckets.setdefault(key, []).append(len(staged) - 1)
+        if filename not in imported:
+            logged.append(filename)
+        if len(staged) >= batch_size:
+            flush()
+    
+    flush()
+    return imported_count, skipped_count, error_count
+
+def import_research(args):
+    """Import new and changed research files"""
+    batch_size = max(1, args.batch_size) if args.bulk else 1
     
+    print("📚 Research Import to Documentation Hub")
+    print("=" * 50)
+    print()
+    
+    imported = load_imported_log()
+    conn = open_import_db(args)
+    manifest = load_manifest(conn)
+    
+    # Find research files
+    files = scan_research_files(MEMORY_DIR)
+    imported_count, skipped_count, error_count = import_files(
+        conn, files, manifest, imported, args, batch_size
+    )
     conn.close()
     
     print()
@@ -133,5 +1018,175 @@ def main():
     print("🔗 View in Documentation Hub:")
     print("   http://localhost:3474/artifacts")
 
+def open_inotify(directory):
+    """Watch `directory` for finished writes and renames; returns an fd, or None without inotify"""
+    if not sys.platform.startswith('linux') or not os.path.isdir(directory):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        fd = libc.inotify_init1(os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    if libc.inotify_add_watch(fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+def read_inotify_events(fd):
+    """Drain pending events; returns (research filenames touched, queue overflowed)"""
+    data = os.read(fd, 64 * 1024)
+    names = set()
+    overflow = False
+    offset = 0
+    while offset < len(data):
+        _, mask, _, length = _INOTIFY_EVENT.unpack_from(data, offset)
+        offset += _INOTIFY_EVENT.size
+        name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+        offset += length
+        if mask & IN_Q_OVERFLOW:
+            overflow = True
+        elif is_research_file(name):
+            names.add(name)
+    return names, overflow
+
+def wait_for_inotify(fd, debounce):
+    """Block until research files change, then keep collecting until `debounce` seconds pass quietly.
+
+    A steady stream of writes is cut off after ten debounce periods so it
+    still lands in bounded batches. Returns the set of filenames, or None
+    when the kernel queue overflowed and a full rescan is needed.
+    """
+    names = set()
+    overflow = False
+    quiet_until = None
+    cutoff = None
+    while True:
+        timeout = None if quiet_until is None else max(0.0, min(quiet_until, cutoff) - time.monotonic())
+        ready, _, _ = select.select([fd], [], [], timeout)
+        if not ready:
+            return None if overflow else names
+        new_names, new_overflow = read_inotify_events(fd)
+        if new_names or new_overflow:
+            names |= new_names
+            overflow = overflow or new_overflow
+            now = time.monotonic()
+            quiet_until = now + debounce
+            if cutoff is None:
+                cutoff = now + debounce * 10
+
+def poll_for_changes(seen, interval, debounce):
+    """Rescan every `interval` seconds until a stat key differs from `seen`; returns changed filenames.
+
+    Changes are rechecked after `debounce` seconds so files still being
+    written are picked up in the same batch. `seen` is updated in place.
+    """
+    while True:
+        time.sleep(interval)
+        changed = set()
+        while True:
+            current = {filename: stat_key(st) for filename, _, st in scan_research_files(MEMORY_DIR)}
+            newly_changed = set(name for name, key in current.items() if seen.get(name) != key)
+            seen.clear()
+            seen.update(current)
+            if not newly_changed:
+                break
+            changed |= newly_changed
+            time.sleep(debounce)
+        if changed:
+            return changed
+
+def watch_research(args):
+    """Import continuously, keeping the DB connection and manifest in memory"""
+    batch_size = max(1, args.batch_size)
+    
+    print("📚 Research Import to Documentation Hub (watch mode)")
+    print("=" * 50)
+    print()
+    
+    imported = load_imported_log()
+    conn = open_import_db(args)
+    manifest = load_manifest(conn)
+    
+    # Catch up on anything written while we weren't running
+    files = scan_research_files(MEMORY_DIR)
+    counts = import_files(conn, files, manifest, imported, args, batch_size)
+    seen = {filename: stat_key(st) for filename, _, st in files}
+    
+    fd = open_inotify(MEMORY_DIR)
+    print()
+    if fd is not None:
+        print(f"👀 Watching {MEMORY_DIR} (inotify, {args.debounce:g}s debounce) - Ctrl-C to stop")
+    else:
+        print(f"👀 Watching {MEMORY_DIR} (polling every {args.poll_interval:g}s) - Ctrl-C to stop")
+    
+    totals = list(counts)
+    try:
+        while True:
+            if fd is not None:
+                changed = wait_for_inotify(fd, args.debounce)
+                files = scan_research_files(MEMORY_DIR) if changed is None else stat_research_files(MEMORY_DIR, changed)
+            else:
+                changed = poll_for_changes(seen, args.poll_interval, args.debounce)
+                files = stat_research_files(MEMORY_DIR, changed)
+            if not files:
+                continue
+            counts = import_files(conn, files, manifest, imported, args, batch_size)
+            totals = [total + count for total, count in zip(totals, counts)]
+            write_metrics(args)
+            print(f"📥 {datetime.now():%H:%M:%S} {len(files)} changed: "
+                  f"{counts[0]} imported, {counts[1]} skipped, {counts[2]} errors")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if fd is not None:
+            os.close(fd)
+        conn.close()
+    
+    print()
+    print(f"📊 Watch stopped: {totals[0]} imported, {totals[1]} skipped, {totals[2]} errors")
+
+def write_metrics(args):
+    """Write METRICS to the --metrics-json / --prometheus-textfile destinations"""
+    if args.metrics_json == '-':
+        print(json.dumps(METRICS.as_dict(), indent=2))
+    elif args.metrics_json:
+        with open(args.metrics_json, 'w') as f:
+            json.dump(METRICS.as_dict(), f, indent=2)
+    if args.prometheus_textfile:
+        # Write-then-rename so the collector never reads a partial file
+        tmp_path = args.prometheus_textfile + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(METRICS.to_prometheus())
+        os.replace(tmp_path, args.prometheus_textfile)
+
+def run_command(args):
+    """Dispatch to the selected subcommand"""
+    if args.command == 'search':
+        search_main(args)
+    elif args.command == 'compress':
+        compress_main(args)
+    elif args.watch:
+        watch_research(args)
+    else:
+        import_research(args)
+
+def main(argv=None):
+    args = parse_args(argv)
+    profiler = cProfile.Profile() if args.profile else None
+    try:
+        if profiler:
+            profiler.runcall(run_command, args)
+        else:
+            run_command(args)
+    finally:
+        if profiler:
+            with open(args.profile, 'w') as f:
+                pstats.Stats(profiler, stream=f).sort_stats('cumulative').print_stats()
+            print(f"🔬 Profile written to {args.profile}")
+        if args.command is None:
+            write_metrics(args)
+
 if __name__ == "__main__":
     main()
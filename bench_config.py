@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Microbenchmark of config access in tight loops
+Compares the per-call cost of workspace_config.get() (cached, and when
+re-stat()ing the env files every call), a cold parse, the old tracker
+load_env() (re-read and re-parse .env into os.environ on every call) and
+a bare os.environ lookup, against a synthetic workspace with .env and
+.env.local
+
+  ./bench_config.py --keys 50 --calls 100000 --json config-bench.json"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import workspace_config
+
+def legacy_load_env(env_path):
+    """x_engagement_tracker.load_env() as it was before workspace_config"""
+    if os.path.exists(env_path):
+        with open(env_path) as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#') and '=' in line:
+                    key, value = line.split('=', 1)
+                    os.environ[key] = value
+
+def write_workspace(directory, keys):
+    """.env with `keys` settings (mixed quoting/export/comments) and a .env.local overriding a few"""
+    lines = ["# synthetic settings"]
+    for i in range(keys):
+        style = i % 4
+        if style == 0:
+            lines.append(f"BENCH_KEY_{i}=value-{i}")
+        elif style == 1:
+            lines.append(f'export BENCH_KEY_{i}="quoted value {i}"')
+        elif style == 2:
+            lines.append(f"BENCH_KEY_{i}='single {i}'")
+        else:
+            lines.append(f"BENCH_KEY_{i}=bare {i} # trailing comment")
+    with open(os.path.join(directory, '.env'), 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+    with open(os.path.join(directory, '.env.local'), 'w') as f:
+        f.write(''.join(f"BENCH_KEY_{i}=local-{i}\n" for i in range(0, keys, 10)))
+
+def per_call(fn, calls):
+    """Best-of-3 mean seconds per call"""
+    best = None
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        elapsed = (time.perf_counter() - start) / calls
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Benchmark workspace config access")
+    parser.add_argument('--keys', type=int, default=50, help="settings in the synthetic .env (default: 50)")
+    parser.add_argument('--calls', type=int, default=100_000, help="calls per measurement (default: 100k)")
+    parser.add_argument('--json', help="write results JSON here")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    directory = tempfile.mkdtemp(prefix='config-bench-')
+    try:
+        write_workspace(directory, args.keys)
+        workspace_config.WORKSPACE = directory
+        key = f"BENCH_KEY_{args.keys - 1}"
+        os.environ.pop(key, None)
+
+        # The first load populates the cache; later get()s re-stat the files at
+        # most once per RECHECK_INTERVAL (the "revalidate" row stats every call)
+        cold_calls = max(1, args.calls // 100)
+        results = {
+            'os.environ.get': per_call(lambda: os.environ.get('HOME'), args.calls),
+            'workspace_config.get (cached)': per_call(lambda: workspace_config.get(key), args.calls),
+        }
+        interval, workspace_config.RECHECK_INTERVAL = workspace_config.RECHECK_INTERVAL, 0
+        results['workspace_config.get (revalidate)'] = per_call(lambda: workspace_config.get(key), args.calls)
+        workspace_config.RECHECK_INTERVAL = interval
+        results.update({
+            'workspace_config.load (cold parse)': per_call(
+                lambda: (workspace_config._cache.clear(), workspace_config.load()), cold_calls),
+            'legacy load_env (re-parse)': per_call(
+                lambda: legacy_load_env(os.path.join(directory, '.env')), cold_calls),
+        })
+        assert workspace_config.get(key) is not None
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    print(f"⏱️  Config access benchmark ({args.keys} keys, {args.calls:,} calls)")
+    print("=" * 50)
+    baseline = results['os.environ.get']
+    for name, seconds in results.items():
+        print(f"   {name:36} {seconds * 1e6:9.2f} µs/call  ({seconds / baseline:8.1f}x os.environ)")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'keys': args.keys, 'calls': args.calls,
+                       'us_per_call': {name: round(s * 1e6, 3) for name, s in results.items()}}, f, indent=2)
+        print(f"\n💾 Results written to {args.json}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Cold-start benchmark for x_engagement_tracker.py local commands
+Runs each command in a fresh interpreter under `python -X importtime`,
+reports wall time over a bare interpreter and the import cost the tracker
+adds, and fails if a local command goes over budget or pulls in a
+network/analytics dependency it shouldn't
+
+  ./bench_tracker_startup.py                 # usage + summary, 20 runs each
+  ./bench_tracker_startup.py --budget-ms 50 --runs 50 --json out.json"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+TRACKER = os.path.join(HERE, 'x_engagement_tracker.py')
+
+# Modules local commands must never import
+HEAVY_MODULES = ['tweepy', 'requests', 'oauthlib', 'requests_oauthlib', 'urllib3', 'numpy']
+
+COMMANDS = {
+    'usage': ['help'],
+    'summary': ['summary'],
+}
+
+def parse_importtime(stderr):
+    """-X importtime lines -> {module: (self_us, cumulative_us, depth)}"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules[name.strip()] = (int(self_us), int(cumulative_us), depth)
+    return modules
+
+def run_once(argv, env):
+    """One fresh interpreter: (wall ms, importtime modules)"""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime'] + argv,
+                            capture_output=True, text=True, env=env)
+    wall = (time.perf_counter() - start) * 1000
+    return wall, parse_importtime(result.stderr)
+
+def bench(argv, env, runs):
+    """Median wall time and the modules/import cost of the last run"""
+    walls = []
+    for _ in range(runs):
+        wall, modules = run_once(argv, env)
+        walls.append(wall)
+    return statistics.median(walls), min(walls), modules
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Startup benchmark for x_engagement_tracker.py")
+    parser.add_argument('--runs', type=int, default=20, help="interpreter launches per command (default: 20)")
+    parser.add_argument('--budget-ms', type=float, default=50.0,
+                        help="max median startup over a bare interpreter (default: 50)")
+    parser.add_argument('--top', type=int, default=8, help="slowest imports to list (default: 8)")
+    parser.add_argument('--json', help="write results JSON here")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    env = dict(os.environ)
+    tmpdir = tempfile.mkdtemp(prefix='tracker-startup-')
+    env['X_HISTORY_DB'] = os.path.join(tmpdir, 'x_history.db')
+
+    print("⏱️  Tracker startup benchmark")
+    print("=" * 50)
+
+    base_median, base_min, base_modules = bench(['-c', 'pass'], env, args.runs)
+    print(f"   bare interpreter  median {base_median:7.1f} ms  min {base_min:7.1f} ms")
+
+    results = {}
+    failed = False
+    for name, command in COMMANDS.items():
+        median, fastest, modules = bench([TRACKER] + command, env, args.runs)
+        added = {mod: info for mod, info in modules.items() if mod not in base_modules}
+        import_ms = sum(cum for _, cum, depth in added.values() if depth == 0) / 1000
+        overhead = median - base_median
+        heavy = [mod for mod in HEAVY_MODULES if mod in modules]
+        ok = overhead <= args.budget_ms and not heavy
+        failed |= not ok
+
+        print(f"{'✅' if ok else '❌'} {name:15} median {median:7.1f} ms  (+{overhead:.1f} ms over bare, "
+              f"imports {import_ms:.1f} ms, {len(added)} modules)")
+        if heavy:
+            print(f"   heavy modules imported: {', '.join(heavy)}")
+        slowest = sorted(added.items(), key=lambda item: item[1][1], reverse=True)[:args.top]
+        for mod, (self_us, cum_us, depth) in slowest:
+            if depth == 0:
+                print(f"      {cum_us / 1000:6.1f} ms  {mod}")
+
+        results[name] = {
+            'median_ms': round(median, 2),
+            'min_ms': round(fastest, 2),
+            'overhead_ms': round(overhead, 2),
+            'import_ms': round(import_ms, 2),
+            'modules': len(added),
+            'heavy_modules': heavy,
+            'ok': ok,
+        }
+
+    report = {
+        'python': sys.version.split()[0],
+        'runs': args.runs,
+        'budget_ms': args.budget_ms,
+        'bare_median_ms': round(base_median, 2),
+        'commands': results,
+    }
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Results written to {args.json}")
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Cross-backend throughput benchmark for x_tracker storage
+Appends N synthetic samples (minute resolution, a few accounts) to each
+backend in batches, reopens it, then times full and windowed range reads
+and latest() lookups
+
+  ./bench_tracker_storage.py                       # 1M samples, all backends
+  ./bench_tracker_storage.py --samples 100000 --backends sqlite json --json out.json"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import x_tracker
+
+BACKENDS = ['memory', 'json', 'sqlite']
+START_TS = 1_700_000_000
+
+def synthetic_samples(count, accounts):
+    """`count` samples spread round-robin over `accounts`, one minute apart per account"""
+    for i in range(count):
+        n = i % accounts
+        step = i // accounts
+        yield x_tracker.Sample(f'account{n}', START_TS + step * 60, 1000 + step // 7, 100 + step // 1000,
+                               50 + step // 30, 3, f'Account{n}', f'Account {n}')
+
+def storage_spec(backend, tmpdir):
+    if backend == 'memory':
+        return 'memory'
+    if backend == 'json':
+        return 'json:' + os.path.join(tmpdir, 'samples.jsonl')
+    return 'sqlite:' + os.path.join(tmpdir, 'samples.db')
+
+def bench_backend(backend, count, accounts, batch, windows):
+    """{phase: seconds/rates} for one backend"""
+    tmpdir = tempfile.mkdtemp(prefix=f'tracker-{backend}-')
+    spec = storage_spec(backend, tmpdir)
+    try:
+        storage = x_tracker.open_storage(spec)
+        samples = synthetic_samples(count, accounts)
+        start = time.perf_counter()
+        while True:
+            chunk = [s for _, s in zip(range(batch), samples)]
+            if not chunk:
+                break
+            storage.append(chunk)
+        append_s = time.perf_counter() - start
+
+        # Reopen so persistent backends are measured reading from disk
+        reopen_s = 0.0
+        if backend != 'memory':
+            storage.close()
+            start = time.perf_counter()
+            storage = x_tracker.open_storage(spec)
+            reopen_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        read = sum(1 for username in storage.accounts() for _ in storage.range(username))
+        scan_s = time.perf_counter() - start
+        assert read == count, (backend, read, count)
+
+        per_account = count // accounts
+        start = time.perf_counter()
+        window_rows = 0
+        for i in range(windows):
+            lo = START_TS + (i * 7919 % per_account) * 60
+            window_rows += sum(1 for _ in storage.range(f'Account{i % accounts}', lo, lo + 86400))
+        window_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for i in range(windows):
+            storage.latest(f'Account{i % accounts}', before=START_TS + (i * 7919 % per_account) * 60)
+        latest_s = time.perf_counter() - start
+        storage.close()
+
+        size = sum(os.path.getsize(os.path.join(tmpdir, f)) for f in os.listdir(tmpdir))
+        return {
+            'append_s': round(append_s, 3),
+            'append_per_s': round(count / append_s),
+            'reopen_s': round(reopen_s, 3),
+            'scan_s': round(scan_s, 3),
+            'scan_per_s': round(count / scan_s),
+            'window_queries': windows,
+            'window_ms': round(window_s / windows * 1000, 3),
+            'window_rows': window_rows,
+            'latest_ms': round(latest_s / windows * 1000, 3),
+            'bytes': size,
+        }
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Benchmark x_tracker storage backends")
+    parser.add_argument('--samples', type=int, default=1_000_000, help="samples to append (default: 1M)")
+    parser.add_argument('--accounts', type=int, default=4, help="accounts the samples are spread over")
+    parser.add_argument('--batch', type=int, default=1000, help="samples per append() call")
+    parser.add_argument('--windows', type=int, default=200, help="one-day range and latest() queries")
+    parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=BACKENDS)
+    parser.add_argument('--json', help="write results JSON here")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    print(f"⏱️  Tracker storage benchmark ({args.samples:,} samples, {args.accounts} accounts, "
+          f"batches of {args.batch:,})")
+    print("=" * 50)
+
+    results = {}
+    for backend in args.backends:
+        r = results[backend] = bench_backend(backend, args.samples, args.accounts, args.batch, args.windows)
+        print(f"📦 {backend}")
+        print(f"   append   {r['append_s']:8.2f}s  {r['append_per_s']:>12,} samples/s")
+        if backend != 'memory':
+            print(f"   reopen   {r['reopen_s']:8.2f}s  {r['bytes'] / 1024 / 1024:>9.1f} MB on disk")
+        print(f"   scan     {r['scan_s']:8.2f}s  {r['scan_per_s']:>12,} samples/s")
+        print(f"   1-day    {r['window_ms']:8.3f} ms/query   latest {r['latest_ms']:.3f} ms/query")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'samples': args.samples, 'accounts': args.accounts, 'batch': args.batch,
+                       'backends': results}, f, indent=2)
+        print(f"\n💾 Results written to {args.json}")
+
+if __name__ == '__main__':
+    main()
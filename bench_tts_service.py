@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Cold-process vs warm-service latency benchmark for Kokoro TTS
+cold: a fresh interpreter per request (import + model load + synthesis),
+      which is what every generate_briefing.py run used to pay
+warm: requests to a running tts_service.py (synthesis only), sequential
+      and as a concurrent burst that exercises micro-batching
+
+  ./bench_tts_service.py --requests 10 --json tts-bench.json"""
+
+import os
+import sys
+import json
+import time
+import signal
+import argparse
+import tempfile
+import statistics
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+import tts_service
+
+SENTENCES = [
+    "Good morning! Here's your morning briefing.",
+    "All systems nominal and the night shift completed successfully.",
+    "QA completed the unit tests with most of them passing.",
+    "The tenant signup feature is merged and the chat interface is live.",
+    "Two items need your attention today.",
+    "Rate limiting protection is now fully deployed.",
+    "Still need your go or no-go on this pivot.",
+    "That's your briefing. Have a great day!",
+]
+
+COLD_SNIPPET = """
+import sys
+from kokoro_onnx import Kokoro
+Kokoro().generate(sys.argv[1], voice='af', speed=1.1)
+"""
+
+def summarize(latencies):
+    """Median/p95/mean in ms"""
+    ordered = sorted(latencies)
+    return {
+        'requests': len(ordered),
+        'p50_ms': round(statistics.median(ordered) * 1000, 1),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 1),
+        'mean_ms': round(statistics.mean(ordered) * 1000, 1),
+    }
+
+def bench_cold(texts):
+    """One fresh interpreter per request"""
+    latencies = []
+    for text in texts:
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', COLD_SNIPPET, text], check=True, capture_output=True)
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies)
+
+def timed_request(text, path):
+    start = time.perf_counter()
+    with tts_service.TTSClient(path) as client:
+        client.generate(text, voice='af', speed=1.1)
+    return time.perf_counter() - start
+
+def bench_warm(texts, path, concurrency):
+    """Sequential requests, then the same texts as one concurrent burst"""
+    sequential = summarize([timed_request(text, path) for text in texts])
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        burst = list(pool.map(lambda text: timed_request(text, path), texts))
+    result = {'sequential': sequential, 'burst': summarize(burst)}
+    result['burst']['wall_ms'] = round((time.perf_counter() - start) * 1000, 1)
+    with tts_service.TTSClient(path) as client:
+        result['service_stats'] = client.stats()
+    return result
+
+def start_service(path, startup_timeout):
+    """Launch tts_service.py (no segment cache, so every request is real inference)"""
+    env = dict(os.environ, TTS_SOCKET=path)
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, os.path.join(HERE, 'tts_service.py'), 'serve', '--no-cache'],
+                            env=env, stdout=subprocess.DEVNULL)
+    while not tts_service.available(path):
+        if proc.poll() is not None:
+            raise SystemExit(f"❌ TTS service exited during startup (code {proc.returncode})")
+        if time.perf_counter() - start > startup_timeout:
+            proc.kill()
+            raise SystemExit("❌ TTS service did not start in time")
+        time.sleep(0.05)
+    return proc, time.perf_counter() - start
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Benchmark cold-process vs warm-service TTS latency")
+    parser.add_argument('--requests', type=int, default=8, help="requests per scenario (default: 8)")
+    parser.add_argument('--concurrency', type=int, default=4, help="clients in the warm burst (default: 4)")
+    parser.add_argument('--startup-timeout', type=float, default=120.0, help="seconds to wait for the service")
+    parser.add_argument('--json', help="write results JSON here")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    texts = [SENTENCES[i % len(SENTENCES)] + ('' if i < len(SENTENCES) else f" Take {i}.")
+             for i in range(args.requests)]
+
+    print("⏱️  TTS latency benchmark")
+    print("=" * 50)
+
+    cold = bench_cold(texts)
+    print(f"   cold process     p50 {cold['p50_ms']:>9.1f} ms  p95 {cold['p95_ms']:>9.1f} ms")
+
+    path = os.path.join(tempfile.mkdtemp(prefix='tts-bench-'), 'tts.sock')
+    proc, startup = start_service(path, args.startup_timeout)
+    try:
+        warm = bench_warm(texts, path, args.concurrency)
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        proc.wait(timeout=30)
+
+    seq, burst = warm['sequential'], warm['burst']
+    print(f"   service startup  {startup * 1000:>13.1f} ms (one-time model load)")
+    print(f"   warm sequential  p50 {seq['p50_ms']:>9.1f} ms  p95 {seq['p95_ms']:>9.1f} ms")
+    print(f"   warm burst x{args.concurrency:<3} p50 {burst['p50_ms']:>9.1f} ms  p95 {burst['p95_ms']:>9.1f} ms"
+          f"  ({burst['wall_ms']:.0f} ms wall)")
+    print(f"   speedup (p50)    {cold['p50_ms'] / seq['p50_ms']:>13.1f}x")
+    stats = warm['service_stats']
+    print(f"   service: {stats['requests']} requests in {stats['batches']} batches, "
+          f"{stats['coalesced']} coalesced")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'cold': cold, 'service_startup_ms': round(startup * 1000, 1), 'warm': warm}, f, indent=2)
+        print(f"\n💾 Results written to {args.json}")
+
+if __name__ == '__main__':
+    main()
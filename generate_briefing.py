@@ -3,7 +3,17 @@
 
 from kokoro_onnx import Kokoro
 import soundfile as sf
+import numpy as np
+import argparse
+import time
 import os
+import re
+import json
+import string
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import tts_cache
+import tts_service
+import workspace_config
 
 # Morning briefing script - natural phrasing for TTS
 SCRIPT = """Good morning! Today is Saturday, February 28th, 2026.
@@ -20,22 +30,313 @@ Also, a quick reminder. Agent Paige vision is now the North Star. Shifted from t
 
 That's your briefing. Have a great Saturday!"""
 
-def generate_briefing():
-    # Initialize Kokoro with default voice model
+OUTPUT_PATH = workspace_config.path("morning_briefing_2026-02-28.wav")
+VOICE = "af"
+SPEED = 1.1
+
+# Chunked mode: silence between sentences / paragraphs (seconds) and how
+# many chunks may be synthesized ahead of the writer
+SENTENCE_PAUSE = 0.25
+PARAGRAPH_PAUSE = 0.6
+CHUNK_WINDOW = 8
+
+# Output encodings: soundfile (format, subtype) and file extension. FLAC and
+# Ogg/Opus are encoded on the fly as chunks are written.
+OUTPUT_FORMATS = {
+    'wav': ('WAV', 'PCM_16', '.wav'),
+    'flac': ('FLAC', 'PCM_16', '.flac'),
+    'opus': ('OGG', 'OPUS', '.opus'),
+}
+
+# Sentence ends: terminal punctuation followed by whitespace (keeps "typemysite.com" intact)
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+def split_script(script, sentence_pause=SENTENCE_PAUSE, paragraph_pause=PARAGRAPH_PAUSE):
+    """Split a script into (sentence, pause_after) chunks on sentence and paragraph boundaries"""
+    chunks = []
+    paragraphs = [p.strip() for p in re.split(r'\n\s*\n', script) if p.strip()]
+    for paragraph in paragraphs:
+        sentences = [s.strip() for s in SENTENCE_END.split(' '.join(paragraph.split())) if s.strip()]
+        for i, sentence in enumerate(sentences):
+            chunks.append((sentence, paragraph_pause if i == len(sentences) - 1 else sentence_pause))
+    if chunks:
+        chunks[-1] = (chunks[-1][0], 0.0)
+    return chunks
+
+_worker_kokoro = None
+
+def _init_worker():
+    """Load one Kokoro (ONNX runtime session) per worker process"""
+    global _worker_kokoro
+    _worker_kokoro = Kokoro()
+
+def _synthesize_chunk(text, voice, speed):
+    """Worker: synthesize one chunk as float32 mono"""
+    audio, sample_rate = _worker_kokoro.generate(text, voice=voice, speed=speed)
+    return np.asarray(audio, dtype=np.float32), sample_rate
+
+def _synthesize_via_service(text, voice, speed, use_cache=True):
+    """Thread task: one request to the running TTS service"""
+    with tts_service.TTSClient(use_cache=use_cache) as client:
+        return client.generate(text, voice=voice, speed=speed)
+
+def iter_synthesized(chunks, voice, speed, workers, cache=None, use_service=False, service_cache=True):
+    """Yield (audio, sample_rate, pause) in script order.
+
+    Cached segments are served memory-mapped; only misses are synthesized,
+    and the worker pool (with its model loads) is only started on the first
+    miss. With `use_service`, misses go to the TTS service from threads
+    instead, so no model is loaded here at all (`service_cache=False`
+    bypasses the service's own segment cache). At most CHUNK_WINDOW chunks
+    are in flight or waiting to be written, so memory stays flat regardless
+    of script length.
+    """
+    pool = None
+    pending = []
+
+    def resolve(entry):
+        text, result, pause = entry
+        if hasattr(result, 'result'):
+            audio, sample_rate = result.result()
+            if cache is not None:
+                cache.put(text, voice, speed, audio, sample_rate)
+            result = (audio, sample_rate)
+        return result + (pause,)
+
+    try:
+        for text, pause in chunks:
+            result = cache.get(text, voice, speed) if cache is not None else None
+            if result is None:
+                if pool is None:
+                    pool = (ThreadPoolExecutor(max_workers=workers) if use_service else
+                            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker))
+                if use_service:
+                    result = pool.submit(_synthesize_via_service, text, voice, speed, service_cache)
+                else:
+                    result = pool.submit(_synthesize_chunk, text, voice, speed)
+            pending.append((text, result, pause))
+            if len(pending) >= CHUNK_WINDOW:
+                yield resolve(pending.pop(0))
+        for entry in pending:
+            yield resolve(entry)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+def write_stream(items, output_path, fmt='wav'):
+    """Write (audio, sample_rate, pause) items to `output_path` as they arrive.
+
+    The encoder is opened on the first chunk (that's when the sample rate is
+    known) and flushed after every chunk, so nothing but the current chunk
+    is held in memory. Returns (frames, sample_rate, seconds to first chunk).
+    """
+    sf_format, subtype, _ = OUTPUT_FORMATS[fmt]
+    start = time.perf_counter()
+    first_chunk = None
+    frames = 0
+    sample_rate = None
+    out = None
+    try:
+        for audio, sample_rate, pause in items:
+            if out is None:
+                out = sf.SoundFile(output_path, 'w', samplerate=sample_rate, channels=1,
+                                   format=sf_format, subtype=subtype)
+            out.write(audio)
+            silence = int(pause * sample_rate)
+            if silence:
+                out.write(np.zeros(silence, dtype=np.float32))
+            out.flush()
+            frames += len(audio) + silence
+            if first_chunk is None:
+                first_chunk = time.perf_counter() - start
+    finally:
+        if out is not None:
+            out.close()
+    return frames, sample_rate, first_chunk
+
+def generate_briefing_chunked(script=SCRIPT, output_path=OUTPUT_PATH, voice=VOICE, speed=SPEED,
+                              workers=None, sentence_pause=SENTENCE_PAUSE, paragraph_pause=PARAGRAPH_PAUSE,
+                              cache=None, use_service=None, service_cache=True):
+    """Synthesize sentence chunks in parallel and stream them, in order, into a WAV file
+    (sentences already in `cache` are reused instead of re-synthesized; a running
+    TTS service is used instead of local workers unless use_service=False, and its
+    segment cache unless service_cache=False)"""
+    workers = workers or max(1, (os.cpu_count() or 2) // 2)
+    if use_service is None:
+        use_service = tts_service.available()
+    chunks = split_script(script, sentence_pause, paragraph_pause)
+
+    start = time.perf_counter()
+    frames, sample_rate, first_chunk = write_stream(
+        iter_synthesized(chunks, voice, speed, workers, cache, use_service, service_cache), output_path
+    )
+    elapsed = time.perf_counter() - start
+    duration = frames / sample_rate if frames else 0.0
+    print(f"Audio saved to: {output_path}")
+    print(f"Duration: {duration:.1f} seconds ({len(chunks)} chunks, "
+          f"{workers} {'service requests in flight' if use_service else 'workers'})")
+    print(f"Time to first chunk: {first_chunk or 0:.2f}s")
+    print(f"Real-time factor: {elapsed / duration if duration else 0:.3f} ({elapsed:.1f}s wall)")
+    if cache is not None:
+        stats = cache.stats()
+        print(f"Segment cache: {stats['hits']} hits, {stats['misses']} synthesized "
+              f"({stats['segments']} segments, {stats['bytes'] / 1024 / 1024:.1f} MB)")
+    return output_path
+
+def generate_briefing(script=SCRIPT, output_path=OUTPUT_PATH, use_service=None, service_cache=True):
+    # Use the running TTS service (model already loaded) when there is one,
+    # otherwise initialize Kokoro with default voice model
     # Model will be downloaded automatically if not present
-    kokoro = Kokoro()
+    if use_service is None:
+        use_service = tts_service.available()
+    kokoro = tts_service.TTSClient(use_cache=service_cache) if use_service else Kokoro()
     
     # Generate audio with voice "af" (American Female)
     # Available voices: af (American Female), am (American Male), etc.
-    audio, sample_rate = kokoro.generate(SCRIPT, voice="af", speed=1.1)
+    audio, sample_rate = kokoro.generate(script, voice=VOICE, speed=SPEED)
+    
+    if use_service:
+        kokoro.close()
     
     # Save to file
-    output_path = "/Users/thindery/.openclaw/workspace/morning_briefing_2026-02-28.wav"
     sf.write(output_path, audio, sample_rate)
     
     print(f"Audio saved to: {output_path}")
     print(f"Duration: {len(audio) / sample_rate:.1f} seconds")
     return output_path
 
+def iter_with_model(chunks, model, voice, speed, cache=None):
+    """Yield (audio, sample_rate, pause) using one already-loaded model (or TTS client)"""
+    for text, pause in chunks:
+        result = cache.get(text, voice, speed) if cache is not None else None
+        if result is None:
+            audio, sample_rate = model.generate(text, voice=voice, speed=speed)
+            audio = np.asarray(audio, dtype=np.float32)
+            if cache is not None:
+                cache.put(text, voice, speed, audio, sample_rate)
+            result = (audio, sample_rate)
+        yield result + (pause,)
+
+def load_batch_jobs(template_path, data_paths):
+    """Render `template_path` ($name placeholders) once per data record.
+
+    Each data file is JSON: one object, or a list of objects. A record's
+    optional "output" key names the output file (without extension);
+    otherwise it's the data file's name, suffixed with the record index
+    for lists. Returns [(name, script)].
+    """
+    with open(template_path) as f:
+        template = string.Template(f.read())
+    jobs = []
+    for data_path in data_paths:
+        with open(data_path) as f:
+            data = json.load(f)
+        records = data if isinstance(data, list) else [data]
+        stem = os.path.splitext(os.path.basename(data_path))[0]
+        for i, record in enumerate(records):
+            name = record.get('output') or (f"{stem}-{i + 1}" if isinstance(data, list) else stem)
+            jobs.append((name, template.substitute(record)))
+    return jobs
+
+def generate_batch(jobs, output_dir, fmt='flac', voice=VOICE, speed=SPEED, cache=None, use_service=None,
+                   sentence_pause=SENTENCE_PAUSE, paragraph_pause=PARAGRAPH_PAUSE, service_cache=True):
+    """Render many briefings in one process with one loaded model (or the TTS service),
+    encoding each straight to `fmt` without an intermediate WAV"""
+    if use_service is None:
+        use_service = tts_service.available()
+    model = tts_service.TTSClient(use_cache=service_cache) if use_service else Kokoro()
+    os.makedirs(output_dir, exist_ok=True)
+    ext = OUTPUT_FORMATS[fmt][2]
+
+    start = time.perf_counter()
+    audio_seconds = 0.0
+    encoded_bytes = 0
+    wav_bytes = 0
+    failed = 0
+    try:
+        for name, script in jobs:
+            output_path = os.path.join(output_dir, name + ext)
+            chunks = split_script(script, sentence_pause, paragraph_pause)
+            try:
+                frames, sample_rate, _ = write_stream(
+                    iter_with_model(chunks, model, voice, speed, cache), output_path, fmt
+                )
+            except Exception as e:
+                print(f"❌ {name}: {e}")
+                failed += 1
+                continue
+            size = os.path.getsize(output_path)
+            duration = frames / sample_rate if frames else 0.0
+            audio_seconds += duration
+            encoded_bytes += size
+            wav_bytes += 44 + frames * 2  # 16-bit mono WAV the one-shot path would have written
+            print(f"✅ {output_path} ({duration:.1f}s, {size / 1024:.0f} KB)")
+    finally:
+        if use_service:
+            model.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"\n📦 {len(jobs) - failed}/{len(jobs)} briefings, {audio_seconds:.1f}s of audio in {elapsed:.1f}s")
+    print(f"   Throughput: {audio_seconds / elapsed if elapsed else 0:.1f} audio-seconds per wall-second")
+    if wav_bytes:
+        print(f"   Size: {encoded_bytes / 1024 / 1024:.2f} MB {fmt} vs {wav_bytes / 1024 / 1024:.2f} MB WAV "
+              f"({100 * (1 - encoded_bytes / wav_bytes):.0f}% smaller)")
+    if cache is not None:
+        stats = cache.stats()
+        print(f"   Segment cache: {stats['hits']} hits, {stats['misses']} synthesized")
+    return failed
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Generate morning briefing audio using Kokoro TTS")
+    parser.add_argument('--chunked', action='store_true',
+                        help="synthesize sentences in parallel and stream them into the WAV")
+    parser.add_argument('--workers', type=int, help="synthesis processes in chunked mode (default: half the CPUs)")
+    parser.add_argument('--sentence-pause', type=float, default=SENTENCE_PAUSE,
+                        help=f"silence between sentences in seconds (default: {SENTENCE_PAUSE})")
+    parser.add_argument('--paragraph-pause', type=float, default=PARAGRAPH_PAUSE,
+                        help=f"silence between paragraphs in seconds (default: {PARAGRAPH_PAUSE})")
+    parser.add_argument('--no-service', action='store_true',
+                        help="load the model in this process even if the TTS service is running")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="don't reuse or store synthesized audio (the local segment cache in "
+                             "chunked/batch mode, and the TTS service's cache)")
+    parser.add_argument('--cache-dir', default=tts_cache.CACHE_DIR,
+                        help=f"segment cache directory (default: {tts_cache.CACHE_DIR})")
+    parser.add_argument('--cache-max-mb', type=float, default=tts_cache.DEFAULT_MAX_BYTES / 1024 / 1024,
+                        help="segment cache size budget in MB (default: 512)")
+    parser.add_argument('--script', help="read the script from this text file instead of the built-in one")
+    parser.add_argument('--output', default=OUTPUT_PATH, help="output WAV path")
+    parser.add_argument('--batch-template', help="batch mode: script template with $placeholders")
+    parser.add_argument('--batch-data', nargs='+', default=[],
+                        help="batch mode: JSON data files (object or list of objects) to render the template with")
+    parser.add_argument('--output-dir', default=os.path.dirname(OUTPUT_PATH),
+                        help="batch mode: directory for rendered briefings")
+    parser.add_argument('--format', choices=sorted(OUTPUT_FORMATS), default='flac',
+                        help="batch mode: output encoding (default: flac)")
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
-    generate_briefing()
+    args = parse_args()
+    cache = None
+    if not args.no_cache and (args.chunked or args.batch_template):
+        cache = tts_cache.SegmentCache(args.cache_dir, int(args.cache_max_mb * 1024 * 1024))
+    if args.batch_template:
+        jobs = load_batch_jobs(args.batch_template, args.batch_data)
+        failed = generate_batch(jobs, args.output_dir, args.format, cache=cache,
+                                use_service=False if args.no_service else None,
+                                sentence_pause=args.sentence_pause, paragraph_pause=args.paragraph_pause,
+                                service_cache=not args.no_cache)
+        raise SystemExit(1 if failed else 0)
+    script = SCRIPT
+    if args.script:
+        with open(args.script) as f:
+            script = f.read()
+    if args.chunked:
+        generate_briefing_chunked(script, args.output, workers=args.workers,
+                                  sentence_pause=args.sentence_pause, paragraph_pause=args.paragraph_pause,
+                                  cache=cache, use_service=False if args.no_service else None,
+                                  service_cache=not args.no_cache)
+    else:
+        generate_briefing(script, args.output, use_service=False if args.no_service else None,
+                          service_cache=not args.no_cache)
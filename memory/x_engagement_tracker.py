@@ -1,108 +1,54 @@
 #!/usr/bin/env python3
 """
 X Engagement Tracker - Check follower stats using X API v2
+(thin CLI over x_tracker, sharing its credentials, client and storage)
 """
 
 import os
 import sys
-import tweepy
 import json
-from datetime import datetime
 
-# Load credentials from environment
-X_API_KEY = os.getenv("X_API_KEY")
-X_API_SECRET = os.getenv("X_API_SECRET")
-X_ACCESS_TOKEN = os.getenv("X_ACCESS_TOKEN")
-X_ACCESS_TOKEN_SECRET = os.getenv("X_ACCESS_TOKEN_SECRET")
-X_USER_ID = os.getenv("X_USER_ID")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import x_api_scheduler
+import x_tracker
+import workspace_config
 
-# Data file to store historical stats
-DATA_FILE = os.path.expanduser("~/.openclaw/workspace/memory/x_follower_stats.json")
-
-def load_stats():
-    """Load previous follower stats"""
-    if os.path.exists(DATA_FILE):
-        with open(DATA_FILE, 'r') as f:
-            return json.load(f)
-    return {"history": []}
-
-def save_stats(stats):
-    """Save follower stats to file"""
-    os.makedirs(os.path.dirname(DATA_FILE), exist_ok=True)
-    with open(DATA_FILE, 'w') as f:
-        json.dump(stats, f, indent=2)
-
-def get_client():
-    """Create Tweepy client with credentials"""
-    return tweepy.Client(
-        consumer_key=X_API_KEY,
-        consumer_secret=X_API_SECRET,
-        access_token=X_ACCESS_TOKEN,
-        access_token_secret=X_ACCESS_TOKEN_SECRET
-    )
+# Historical stats live in x_tracker's configured storage (X_TRACKER_STORAGE,
+# by default the X_HISTORY_DB store); import the old
+# ~/.openclaw/workspace/memory/x_follower_stats.json once with
+# `x_history_store.py import-json`
 
 def check_followers():
-    """Get current follower count"""
+    """Get current follower count (X_USER_ID, or the authenticated account)"""
     try:
-        client = get_client()
+        client = x_tracker.get_client()
+        with x_tracker.open_storage() as storage:
+            current, previous = x_tracker.check(client, storage, workspace_config.get('X_USER_ID'))
         
-        # Get user info including public metrics
-        user = client.get_me(user_fields=['public_metrics', 'username', 'name'])
+        previous_followers = previous.followers if previous else 0
+        growth = current.followers - previous_followers
         
-        if user and user.data:
-            metrics = user.data.public_metrics
-            current_followers = metrics.get('followers_count', 0)
-            following_count = metrics.get('following_count', 0)
-            tweet_count = metrics.get('tweet_count', 0)
-            
-            # Load previous stats
-            stats = load_stats()
-            
-            # Calculate growth
-            previous_followers = 0
-            if stats["history"]:
-                previous_followers = stats["history"][-1].get("followers", 0)
-            
-            growth = current_followers - previous_followers
-            
-            # Create entry
-            entry = {
-                "timestamp": datetime.now().isoformat(),
-                "followers": current_followers,
-                "following": following_count,
-                "tweets": tweet_count
-            }
-            
-            stats["history"].append(entry)
-            stats["username"] = user.data.username
-            stats["display_name"] = user.data.name
-            
-            # Keep only last 30 days of history
-            if len(stats["history"]) > 30:
-                stats["history"] = stats["history"][-30:]
-            
-            save_stats(stats)
-            
-            # Print results
-            print(f"Account: @{user.data.username} ({user.data.name})")
-            print(f"Followers: {current_followers}")
-            print(f"Growth: {growth:+d}")
-            print(f"Following: {following_count}")
-            print(f"Tweets: {tweet_count}")
-            
-            return {
-                "username": user.data.username,
-                "display_name": user.data.name,
-                "followers": current_followers,
-                "following": following_count,
-                "tweets": tweet_count,
-                "growth": growth,
-                "previous_followers": previous_followers
-            }
-        else:
-            print("ERROR: Could not retrieve user data")
-            return None
+        # Print results
+        print(f"Account: @{current.username} ({current.name})")
+        print(f"Followers: {current.followers}")
+        print(f"Growth: {growth:+d}")
+        print(f"Following: {current.following}")
+        print(f"Tweets: {current.tweets}")
+        
+        return {
+            "username": current.username,
+            "display_name": current.name,
+            "followers": current.followers,
+            "following": current.following,
+            "tweets": current.tweets,
+            "growth": growth,
+            "previous_followers": previous_followers
+        }
             
+    except x_api_scheduler.RateLimitDeferred as e:
+        print(f"DEFERRED: {e}")
+        return {"deferred": True, "retry_at": e.reset}
+        
     except Exception as e:
         print(f"ERROR: {e}")
         return None
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""research-import.py near-duplicate detection: MinHash estimates and
+LSH candidate lookups that stay index-driven on a large table
+
+  python3 -m pytest tests/      (or: python3 -m unittest discover tests)"""
+
+import os
+import random
+import sqlite3
+import unittest
+import importlib.util
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+IMPORTER = os.path.join(os.path.dirname(HERE), 'backlog', 'research-import.py')
+
+spec = importlib.util.spec_from_file_location('research_import', IMPORTER)
+research_import = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(research_import)
+
+# Large enough that a scan of artifact_lsh (32 rows per artifact) shows up
+INDEXED_ARTIFACTS = 20_000
+
+def words(rng, count):
+    return [''.join(rng.choice('abcdefghijklmnop') for _ in range(6)) for _ in range(count)]
+
+def shingle_jaccard(a, b, size=research_import.SHINGLE_WORDS):
+    sa = {tuple(a[i:i + size]) for i in range(len(a) - size + 1)}
+    sb = {tuple(b[i:i + size]) for i in range(len(b) - size + 1)}
+    return len(sa & sb) / len(sa | sb)
+
+@unittest.skipIf(research_import.np is None, "NumPy is not installed")
+class MinHashTest(unittest.TestCase):
+    def test_estimates_track_shingle_jaccard(self):
+        rng = random.Random(7)
+        original = words(rng, 1500)
+        signature = research_import.minhash_signature(' '.join(original))
+        self.assertEqual(len(signature), research_import.MINHASH_PERMUTATIONS)
+        self.assertTrue(all(0 <= value < 2 ** 32 for value in signature))
+        for every in (100, 25, 8):
+            edited = [w if i % every else 'changed' for i, w in enumerate(original)]
+            estimate = research_import.estimate_jaccard(
+                signature, research_import.minhash_signature(' '.join(edited)))
+            self.assertAlmostEqual(estimate, shingle_jaccard(original, edited), delta=0.12)
+
+    def test_short_and_empty_content(self):
+        self.assertEqual(research_import.minhash_signature('Same Words'),
+                         research_import.minhash_signature('same   words'))
+        self.assertEqual(len(research_import.minhash_signature('')), research_import.MINHASH_PERMUTATIONS)
+
+@unittest.skipIf(research_import.np is None, "NumPy is not installed")
+class FindNearDuplicateTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.conn = sqlite3.connect(':memory:')
+        cls.conn.create_function('artifact_content', 2, research_import.read_artifact_content, deterministic=True)
+        cls.conn.execute("""
+            CREATE TABLE artifacts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                artifact_number TEXT UNIQUE NOT NULL,
+                title TEXT NOT NULL,
+                content TEXT,
+                content_hash TEXT
+            )
+        """)
+        research_import.ensure_schema(cls.conn)
+        rng = random.Random(3)
+        cls.original = words(rng, 1200)
+        with cls.conn:
+            research_import.index_signatures(cls.conn, [
+                (f"DOC-{i:06d}", tuple(rng.getrandbits(32) for _ in range(research_import.MINHASH_PERMUTATIONS)))
+                for i in range(INDEXED_ARTIFACTS)
+            ] + [('DOC-ORIGINAL', research_import.minhash_signature(' '.join(cls.original)))])
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.conn.close()
+
+    def lookup(self, content):
+        return research_import.find_near_duplicate(
+            self.conn, research_import.minhash_signature(content), research_import.NEAR_DUP_THRESHOLD)
+
+    def test_finds_the_near_duplicate(self):
+        edited = list(self.original)
+        edited[600] = 'changed'
+        number, similarity = self.lookup(' '.join(edited))
+        self.assertEqual(number, 'DOC-ORIGINAL')
+        self.assertGreaterEqual(similarity, research_import.NEAR_DUP_THRESHOLD)
+        self.assertIsNone(self.lookup(' '.join(words(random.Random(11), 1200))))
+
+    def test_candidate_lookup_searches_the_lsh_primary_key(self):
+        statements = []
+        self.conn.set_trace_callback(statements.append)
+        try:
+            self.lookup(' '.join(self.original))
+        finally:
+            self.conn.set_trace_callback(None)
+        candidate_sql = next(sql for sql in statements if 'artifact_lsh' in sql)
+        plan = [row[3] for row in self.conn.execute("EXPLAIN QUERY PLAN " + candidate_sql)]
+        self.assertTrue(any(step.startswith('SEARCH l USING PRIMARY KEY') for step in plan), plan)
+        self.assertFalse(any(step.startswith('SCAN') and ('artifact_lsh' in step or step == 'SCAN l')
+                             for step in plan), plan)
+
+if __name__ == '__main__':
+    unittest.main()
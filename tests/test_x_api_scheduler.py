@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""x_api_scheduler rate-limit paths against the local X users stub: the
+persisted bucket, deferral, stale cache, 429 reset and 5xx backoff
+
+Sleeps run on a fake clock, so waits up to the reset cost no real time.
+
+  python3 -m pytest tests/      (or: python3 -m unittest discover tests)"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+import x_tracker
+import x_api_scheduler
+from x_users_stub import UsersStub
+
+try:
+    import tweepy
+except ImportError:
+    tweepy = None
+
+MAX_WAIT = 10
+
+class FakeClock:
+    """time.time/time.sleep for x_api_scheduler: sleeping advances the clock"""
+
+    def __init__(self):
+        self.now = time.time()
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+@unittest.skipIf(tweepy is None, "tweepy is not installed")
+class ScheduledClientTest(unittest.TestCase):
+    def setUp(self):
+        self.stub = UsersStub().start()
+        self.addCleanup(self.stub.stop)
+        self.cache_dir = tempfile.mkdtemp(prefix='x-scheduler-test-')
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+        self.clock = FakeClock()
+        clock = SimpleNamespace(time=self.clock.time, sleep=self.clock.sleep,
+                                strftime=time.strftime, localtime=time.localtime)
+        patcher = mock.patch.object(x_api_scheduler, 'time', clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def client(self, ttl=0):
+        client = tweepy.Client(consumer_key='key', consumer_secret='secret',
+                               access_token='token', access_token_secret='token-secret')
+        x_tracker.mount_base_url(client.session, self.stub.base_url)
+        return x_api_scheduler.ScheduledClient(client, cache_dir=self.cache_dir, ttl=ttl, max_wait=MAX_WAIT)
+
+    def exhaust(self, reset_in):
+        """Next responses advertise an empty bucket until now + reset_in"""
+        self.stub.remaining = 0
+        self.stub.reset = int(self.clock.now + reset_in)
+
+    def test_empty_bucket_defers_without_calling_the_api(self):
+        self.exhaust(600)
+        client = self.client()
+        client.get_user(id='101')
+        with self.assertRaises(x_api_scheduler.RateLimitDeferred) as deferred:
+            client.get_user(id='102')
+        self.assertEqual(deferred.exception.reset, self.stub.reset)
+        self.assertEqual(len(self.stub.requests), 1)
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_second_instance_defers_from_the_persisted_bucket(self):
+        self.exhaust(600)
+        self.client().get_user(id='101')
+        self.assertTrue(os.path.exists(os.path.join(self.cache_dir, 'rate_limits.json')))
+        with self.assertRaises(x_api_scheduler.RateLimitDeferred):
+            self.client().get_user(id='102')
+        self.assertEqual(len(self.stub.requests), 1)
+
+    def test_empty_bucket_waits_for_a_reset_within_max_wait(self):
+        self.exhaust(5)
+        client = self.client()
+        client.get_user(id='101')
+        reset = self.stub.reset
+        self.stub.remaining = 299
+        response = client.get_user(id='102')
+        self.assertEqual(response.data.id, 102)
+        self.assertEqual(len(self.clock.sleeps), 1)
+        self.assertGreaterEqual(response.fetched_at, reset)
+        self.assertEqual(len(self.stub.requests), 2)
+
+    def test_stale_cache_served_when_reset_is_beyond_max_wait(self):
+        self.exhaust(600)
+        client = self.client()
+        first = client.get_user(id='101')
+        self.clock.now += 60
+        again = client.get_user(id='101')
+        self.assertEqual(again.data.id, 101)
+        self.assertEqual(again.fetched_at, first.fetched_at)
+        self.assertEqual(len(self.stub.requests), 1)
+
+    def test_429_retries_no_earlier_than_the_reset(self):
+        self.exhaust(5)
+        self.stub.failures = [429]
+        reset = self.stub.reset
+        with mock.patch.object(x_api_scheduler, 'backoff_delay', return_value=0.5):
+            response = self.client().get_user(id='101')
+        self.assertEqual(response.data.id, 101)
+        self.assertEqual(len(self.stub.requests), 2)
+        self.assertEqual(len(self.clock.sleeps), 1)
+        self.assertGreaterEqual(response.fetched_at, reset)
+
+    def test_429_with_a_distant_reset_defers(self):
+        self.exhaust(600)
+        self.stub.failures = [429]
+        with self.assertRaises(x_api_scheduler.RateLimitDeferred):
+            self.client().get_user(id='101')
+        self.assertEqual(len(self.stub.requests), 1)
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_5xx_backs_off_with_full_jitter(self):
+        self.stub.failures = [503, 503]
+        with mock.patch.object(x_api_scheduler.random, 'uniform', side_effect=lambda low, high: high / 2) as uniform:
+            response = self.client().get_user(id='101')
+        self.assertEqual(response.data.id, 101)
+        self.assertEqual(uniform.call_args_list, [mock.call(0, 1.0), mock.call(0, 2.0)])
+        self.assertEqual(self.clock.sleeps, [0.5, 1.0])
+        self.assertEqual(len(self.stub.requests), 3)
+
+    def test_5xx_gives_up_after_max_retries(self):
+        self.stub.failures = [503] * (x_api_scheduler.MAX_RETRIES + 1)
+        with mock.patch.object(x_api_scheduler, 'backoff_delay', return_value=0):
+            with self.assertRaises(tweepy.TwitterServerError):
+                self.client().get_user(id='101')
+        self.assertEqual(len(self.stub.requests), x_api_scheduler.MAX_RETRIES + 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""x_tracker portfolio lookups against the local X users stub
+
+  python3 -m pytest tests/      (or: python3 -m unittest discover tests)"""
+
+import io
+import os
+import sys
+import time
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+import x_tracker
+import x_api_scheduler
+import x_engagement_tracker
+from x_users_stub import UsersStub
+
+try:
+    import tweepy
+except ImportError:
+    tweepy = None
+
+# 250 ids and 120 handles, interleaved: 3 id lookups + 2 username lookups
+IDS = [str(1_000_000 + i) for i in range(250)]
+HANDLES = [f'@handle{i}' if i % 2 else f'handle{i}' for i in range(120)]
+ACCOUNTS = [a for pair in zip(IDS, HANDLES) for a in pair] + IDS[len(HANDLES):]
+MISSING = {IDS[5], 'handle7'}
+
+class CountingStorage(x_tracker.MemoryStorage):
+    """MemoryStorage that records every append() batch"""
+
+    def __init__(self):
+        super().__init__()
+        self.appends = []
+
+    def append(self, samples):
+        samples = list(samples)
+        self.appends.append(samples)
+        return super().append(samples)
+
+class ChunkLookupsTest(unittest.TestCase):
+    def test_splits_ids_and_handles_into_lookups_of_100(self):
+        chunks = x_tracker.chunk_lookups(ACCOUNTS)
+        self.assertEqual([list(c) for c in chunks], [['ids']] * 3 + [['usernames']] * 2)
+        self.assertEqual([len(next(iter(c.values()))) for c in chunks], [100, 100, 50, 100, 20])
+        self.assertEqual(sum((c.get('ids', []) for c in chunks), []), IDS)
+        self.assertEqual(sum((c.get('usernames', []) for c in chunks), []), [h.lstrip('@') for h in HANDLES])
+
+    def test_exact_and_empty(self):
+        self.assertEqual(x_tracker.chunk_lookups(IDS[:100]), [{'ids': IDS[:100]}])
+        self.assertEqual(x_tracker.chunk_lookups([]), [])
+
+@unittest.skipIf(tweepy is None, "tweepy is not installed")
+class FetchPortfolioTest(unittest.TestCase):
+    def setUp(self):
+        self.stub = UsersStub(delay=0.2, missing=MISSING).start()
+        self.addCleanup(self.stub.stop)
+        self.cache_dir = tempfile.mkdtemp(prefix='x-tracker-test-')
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+
+    def client(self):
+        client = tweepy.Client(consumer_key='key', consumer_secret='secret',
+                               access_token='token', access_token_secret='token-secret')
+        x_tracker.mount_base_url(client.session, self.stub.base_url)
+        return x_api_scheduler.ScheduledClient(client, cache_dir=self.cache_dir, ttl=0)
+
+    def test_one_request_per_chunk_with_bounded_concurrency(self):
+        samples, errors = x_tracker.fetch_portfolio(self.client(), ACCOUNTS, concurrency=3)
+        lookups = [query for path, query in self.stub.requests]
+        self.assertEqual(len(lookups), 5)
+        self.assertTrue(all(len(q.get('ids', q.get('usernames', '')).split(',')) <= 100 for q in lookups))
+        self.assertEqual(self.stub.peak_in_flight, 3)
+        self.assertEqual(len(samples), len(ACCOUNTS) - len(MISSING))
+
+    def test_serial_when_concurrency_is_one(self):
+        x_tracker.fetch_portfolio(self.client(), IDS, concurrency=1)
+        self.assertEqual(self.stub.peak_in_flight, 1)
+
+    def test_partial_errors_keep_the_found_accounts(self):
+        samples, errors = x_tracker.fetch_portfolio(self.client(), ACCOUNTS, concurrency=3)
+        self.assertEqual({e['value'] for e in errors}, MISSING)
+        found = {s.account for s in samples}
+        self.assertIn('user1000000', found)
+        self.assertIn('handle1', found)
+        self.assertNotIn(f'user{IDS[5]}', found)
+        self.assertNotIn('handle7', found)
+
+    def test_cached_responses_keep_their_fetch_time(self):
+        client = self.client()
+        client.ttl = 300
+        first, _ = x_tracker.fetch_portfolio(client, ACCOUNTS, concurrency=3)
+        time.sleep(1.1)
+        again, _ = x_tracker.fetch_portfolio(client, ACCOUNTS, concurrency=3)
+        self.assertEqual(len(self.stub.requests), 5)
+        self.assertEqual([s.ts for s in again], [s.ts for s in first])
+
+        storage = x_tracker.MemoryStorage()
+        storage.append(first)
+        storage.append(again)
+        self.assertEqual(len(list(storage.range('user1000000'))), 1)
+
+    def test_portfolio_command_stores_one_batch(self):
+        accounts_path = os.path.join(self.cache_dir, 'accounts.txt')
+        with open(accounts_path, 'w') as f:
+            f.write('\n'.join(ACCOUNTS) + '\n')
+        storage = CountingStorage()
+        output = io.StringIO()
+        with mock.patch.object(x_tracker, 'get_client', self.client), \
+                mock.patch.object(x_tracker, 'open_storage', lambda spec=None: storage), \
+                mock.patch.object(sys, 'argv', ['x_engagement_tracker.py', 'portfolio', accounts_path]), \
+                redirect_stdout(output):
+            x_engagement_tracker.main()
+        self.assertEqual(len(storage.appends), 1)
+        self.assertEqual(len(storage.appends[0]), len(ACCOUNTS) - len(MISSING))
+        self.assertIn(f"{len(ACCOUNTS) - len(MISSING)}/{len(ACCOUNTS)} accounts fetched in 5 request(s)",
+                      output.getvalue())
+
+class CompactedStorage(x_tracker.MemoryStorage):
+    """MemoryStorage where one account's raw samples were compacted away"""
+
+    def accounts(self):
+        return super().accounts() + ['compacted']
+
+    def latest(self, username, before=None):
+        return None if username == 'compacted' else super().latest(username, before)
+
+class DaemonStartupTest(unittest.TestCase):
+    def test_skips_accounts_without_a_latest_sample(self):
+        storage = CompactedStorage()
+        storage.append([x_tracker.Sample('kept', 1_700_000_000, 10, 5, 3)])
+        started = []
+
+        def serve_latest(state, lock, path):
+            started.append(dict(state['accounts']))
+            raise KeyboardInterrupt
+
+        with mock.patch.object(x_tracker, 'get_client', lambda ttl=None: None), \
+                mock.patch.object(x_tracker, 'load_accounts', lambda: ['kept']), \
+                mock.patch.object(x_tracker, 'open_storage', lambda spec=None: storage), \
+                mock.patch.object(x_engagement_tracker, 'serve_latest', serve_latest):
+            with self.assertRaises(KeyboardInterrupt):
+                x_engagement_tracker.run_daemon(60)
+        self.assertEqual(list(started[0]), ['kept'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Local stub of the X API v2 users endpoints
+Serves GET /2/users?ids=, /2/users/by?usernames=, /2/users/me and
+/2/users/:id with synthetic public_metrics, so the trackers can run
+end to end without credentials (point X_API_BASE_URL at it). Lookups of
+more than 100 values get a 400 like the real API, ids in `missing` come
+back as partial `errors`, and every request is recorded along with the
+peak number in flight.
+
+Rate limiting is scripted: every response advertises `remaining` calls
+until `reset`, and statuses queued in `failures` (429 or 5xx) are served,
+one per request, before normal responses resume.
+
+  python3 tests/x_users_stub.py --port 18777
+  python3 tests/x_users_stub.py --remaining 0 --fail 429 503"""
+
+import json
+import time
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+MAX_LOOKUP = 100
+ME_ID = '777'
+
+def user(user_id, username):
+    """Users payload entry with metrics derived from the id"""
+    n = int(user_id)
+    return {
+        'id': user_id,
+        'username': username,
+        'name': username.title(),
+        'public_metrics': {
+            'followers_count': n % 10_000,
+            'following_count': n % 100,
+            'tweet_count': n % 1000,
+            'listed_count': n % 7,
+        },
+    }
+
+def username_id(username):
+    """Stable numeric id for a handle"""
+    return str(int.from_bytes(username.lower().encode()[:6], 'big'))
+
+class UsersStub(ThreadingHTTPServer):
+    """Threaded server holding the stub's settings and request log"""
+
+    daemon_threads = True
+
+    def __init__(self, port=0, delay=0.0, missing=(), remaining=299, reset=None, failures=()):
+        super().__init__(('127.0.0.1', port), Handler)
+        self.delay = delay
+        self.missing = set(missing)
+        self.remaining = remaining
+        self.reset = reset
+        self.failures = list(failures)
+        self.requests = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        stub = self.server
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        with stub.lock:
+            stub.requests.append((url.path, query))
+            stub.in_flight += 1
+            stub.peak_in_flight = max(stub.peak_in_flight, stub.in_flight)
+        try:
+            time.sleep(stub.delay)
+            with stub.lock:
+                failure = stub.failures.pop(0) if stub.failures else None
+            if failure == 429:
+                return self.send_json(429, {'title': 'Too Many Requests', 'detail': 'Too Many Requests'},
+                                      remaining=0)
+            if failure:
+                return self.send_json(failure, {'title': 'Service Unavailable', 'detail': 'Service Unavailable'})
+            self.respond(url.path.rstrip('/'), query)
+        finally:
+            with stub.lock:
+                stub.in_flight -= 1
+
+    def respond(self, path, query):
+        parts = path.split('/')
+        if path == '/2/users' and 'ids' in query:
+            values = query['ids'].split(',')
+            lookup = [(v, None if v in self.server.missing else user(v, f'user{v}')) for v in values]
+        elif path == '/2/users/by' and 'usernames' in query:
+            values = query['usernames'].split(',')
+            lookup = [(v, None if v in self.server.missing else user(username_id(v), v)) for v in values]
+        elif len(parts) == 4 and parts[:3] == ['', '2', 'users'] and parts[3] not in ('', 'by'):
+            user_id = ME_ID if parts[3] == 'me' else parts[3]
+            return self.send_json(200, {'data': user(user_id, 'RemyLobster' if user_id == ME_ID else f'user{user_id}')})
+        else:
+            return self.send_json(404, {'title': 'Not Found', 'detail': path})
+
+        if len(values) > MAX_LOOKUP:
+            return self.send_json(400, {'errors': [{'message': f'at most {MAX_LOOKUP} values per lookup'}],
+                                        'title': 'Invalid Request', 'detail': 'One or more parameters are invalid.'})
+        body = {'data': [found for _, found in lookup if found]}
+        errors = [{'value': value, 'detail': f'Could not find user: [{value}].', 'title': 'Not Found Error'}
+                  for value, found in lookup if not found]
+        if errors:
+            body['errors'] = errors
+        self.send_json(200, body)
+
+    def send_json(self, status, body, remaining=None):
+        stub = self.server
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('content-type', 'application/json')
+        self.send_header('content-length', str(len(data)))
+        self.send_header('x-rate-limit-limit', '300')
+        self.send_header('x-rate-limit-remaining', str(stub.remaining if remaining is None else remaining))
+        self.send_header('x-rate-limit-reset', str(int(stub.reset or time.time() + 900)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a stub of the X API v2 users endpoints")
+    parser.add_argument('--port', type=int, default=18777)
+    parser.add_argument('--delay', type=float, default=0.0, help="seconds each response is held")
+    parser.add_argument('--missing', nargs='*', default=[], help="ids/usernames reported as not found")
+    parser.add_argument('--remaining', type=int, default=299, help="x-rate-limit-remaining to advertise")
+    parser.add_argument('--reset-in', type=float, default=900, help="seconds until the advertised reset")
+    parser.add_argument('--fail', nargs='*', type=int, default=[], help="statuses (429, 503...) to serve first")
+    args = parser.parse_args()
+    stub = UsersStub(args.port, args.delay, args.missing, args.remaining, time.time() + args.reset_in, args.fail)
+    print(f"🧪 X users stub on {stub.base_url}", flush=True)
+    try:
+        stub.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Content-addressed cache of synthesized speech segments
+Segments are keyed by (normalized text, voice, speed, model hash) and stored
+as raw float32 PCM files that are memory-mapped on read; an SQLite index
+tracks size and last use for LRU eviction under a byte budget"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import unicodedata
+import numpy as np
+import workspace_config
+
+# Paths
+CACHE_DIR = workspace_config.get('TTS_CACHE_DIR') or workspace_config.path('tts-cache')
+MODEL_PATH = workspace_config.get('KOKORO_MODEL', 'kokoro-v1.0.onnx')
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+PCM_DTYPE = np.float32
+
+def normalize_text(text):
+    """Whitespace/Unicode-insensitive form of a sentence (case and punctuation affect prosody, so they stay)"""
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+def model_fingerprint(path=MODEL_PATH, cache_dir=CACHE_DIR):
+    """SHA-256 of the model file, memoized on (size, mtime) so large models are hashed once.
+    Falls back to the kokoro_onnx version when the model file isn't found."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        try:
+            from importlib.metadata import version
+            return 'kokoro_onnx-' + version('kokoro_onnx')
+        except Exception:
+            return 'kokoro_onnx-unknown'
+
+    memo_path = os.path.join(cache_dir, 'model-hash.json')
+    stamp = [os.path.abspath(path), st.st_size, st.st_mtime_ns]
+    try:
+        with open(memo_path) as f:
+            memo = json.load(f)
+        if memo['stamp'] == stamp:
+            return memo['sha256']
+    except (OSError, ValueError, KeyError):
+        pass
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(memo_path, 'w') as f:
+        json.dump({'stamp': stamp, 'sha256': digest.hexdigest()}, f)
+    return digest.hexdigest()
+
+class SegmentCache:
+    """On-disk LRU cache of synthesized segments (not thread-safe; callers sharing one serialize access)"""
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, model_hash=None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+        self.model_hash = model_hash or model_fingerprint(cache_dir=cache_dir)
+        self.conn = sqlite3.connect(os.path.join(cache_dir, 'index.db'), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS segments (
+                key TEXT PRIMARY KEY,
+                sample_rate INTEGER NOT NULL,
+                frames INTEGER NOT NULL,
+                bytes INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_segments_last_used ON segments(last_used)")
+        self.conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, text, voice, speed):
+        """Content address of a segment"""
+        ident = json.dumps([normalize_text(text), voice, round(float(speed), 4), self.model_hash])
+        return hashlib.sha256(ident.encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + '.f32')
+
+    def get(self, text, voice, speed):
+        """(memory-mapped float32 audio, sample_rate) or None"""
+        key = self.key(text, voice, speed)
+        row = self.conn.execute("SELECT sample_rate, frames FROM segments WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        sample_rate, frames = row
+        try:
+            audio = np.memmap(self._path(key), dtype=PCM_DTYPE, mode='r') if frames else np.zeros(0, PCM_DTYPE)
+        except (OSError, ValueError):
+            self.conn.execute("DELETE FROM segments WHERE key = ?", (key,))
+            self.conn.commit()
+            self.misses += 1
+            return None
+        self.conn.execute("UPDATE segments SET last_used = ? WHERE key = ?", (time.time(), key))
+        self.conn.commit()
+        self.hits += 1
+        return audio, sample_rate
+
+    def put(self, text, voice, speed, audio, sample_rate):
+        """Store a segment (atomically) and evict least-recently-used ones over budget"""
+        key = self.key(text, voice, speed)
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = np.ascontiguousarray(audio, dtype=PCM_DTYPE)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        data.tofile(tmp)
+        os.replace(tmp, path)
+        self.conn.execute("""
+            INSERT OR REPLACE INTO segments (key, sample_rate, frames, bytes, last_used)
+            VALUES (?, ?, ?, ?, ?)
+        """, (key, sample_rate, len(data), data.nbytes, time.time()))
+        self.conn.commit()
+        self.evict()
+
+    def evict(self):
+        """Drop least-recently-used segments until the cache fits in max_bytes"""
+        total = self.conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM segments").fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+        evicted = 0
+        for key, size in self.conn.execute("SELECT key, bytes FROM segments ORDER BY last_used").fetchall():
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(self._path(key))
+            except FileNotFoundError:
+                pass
+            self.conn.execute("DELETE FROM segments WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        self.conn.commit()
+        return evicted
+
+    def stats(self):
+        """Segment count and bytes on disk"""
+        count, size = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM segments").fetchone()
+        return {'segments': count, 'bytes': size, 'hits': self.hits, 'misses': self.misses}
+
+    def close(self):
+        self.conn.close()
+
+def main():
+    """Main entry point"""
+    command = sys.argv[1] if len(sys.argv) > 1 else 'stats'
+    cache = SegmentCache(model_hash='-')
+
+    if command == 'stats':
+        stats = cache.stats()
+        print(f"🗂️  {stats['segments']:,} segments, {stats['bytes'] / 1024 / 1024:.1f} MB in {CACHE_DIR}")
+
+    elif command == 'prune':
+        cache.max_bytes = int(float(sys.argv[2]) * 1024 * 1024) if len(sys.argv) > 2 else DEFAULT_MAX_BYTES
+        print(f"🧹 Evicted {cache.evict()} segments")
+
+    else:
+        print(f"Usage: {sys.argv[0]} [stats|prune [max_mb]]")
+        sys.exit(1)
+
+    cache.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""Long-lived Kokoro TTS service
+Loads the model once and serves synthesis jobs over a Unix socket, so
+briefings and clips don't each pay the ONNX model/voices load
+
+  ./tts_service.py serve              # run the service
+  ./tts_service.py say "Hello there"  # one request through the client
+
+Protocol: one JSON request line {"text", "voice", "speed"} (plus
+"no_cache": true to bypass the segment cache); the reply is a JSON header line {"sample_rate", "frames"} (or {"error"}) followed by
+frames * 4 bytes of little-endian float32 PCM"""
+
+import os
+import sys
+import json
+import time
+import queue
+import socket
+import threading
+from functools import partial
+import numpy as np
+import workspace_config
+
+# Paths
+SOCKET_PATH = workspace_config.get('TTS_SOCKET') or workspace_config.path('data', 'tts.sock')
+
+# Micro-batching: after the first queued job, wait this long for more, up to MAX_BATCH
+BATCH_WINDOW = 0.01
+MAX_BATCH = 8
+# Inference threads sharing the one loaded session (ONNX runtime releases the GIL)
+INFERENCE_THREADS = max(1, (os.cpu_count() or 2) // 2)
+
+class Job:
+    """One queued synthesis request"""
+
+    def __init__(self, text, voice, speed, use_cache=True):
+        self.key = (text, voice, float(speed), bool(use_cache))
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class TTSService:
+    """Queue in front of one Kokoro instance.
+
+    A dispatcher thread drains the queue in micro-batches: identical
+    requests (in a batch, or already being synthesized) are synthesized
+    once, distinct ones run concurrently on INFERENCE_THREADS against the
+    shared session, and cached segments (tts_cache) are answered without
+    inference. Each synthesis completes its own jobs from a done-callback,
+    so a slow segment never holds up the next batch.
+    """
+
+    def __init__(self, kokoro, cache=None, threads=INFERENCE_THREADS):
+        from concurrent.futures import ThreadPoolExecutor
+        self.kokoro = kokoro
+        self.cache = cache
+        self.cache_lock = threading.Lock()
+        self.jobs = queue.Queue()
+        self.executor = ThreadPoolExecutor(max_workers=threads)
+        # Guards stats and in_flight (key -> jobs waiting on that synthesis)
+        self.lock = threading.Lock()
+        self.in_flight = {}
+        self.stats = {'requests': 0, 'batches': 0, 'synthesized': 0, 'coalesced': 0, 'cached': 0}
+        threading.Thread(target=self._dispatch, daemon=True).start()
+
+    def submit(self, text, voice, speed, use_cache=True):
+        """Queue a job and block until it's done; returns (float32 audio, sample_rate)"""
+        job = Job(text, voice, speed, use_cache)
+        self.jobs.put(job)
+        job.done.wait()
+        if job.error:
+            raise job.error
+        return job.result
+
+    def snapshot(self):
+        """Copy of the counters"""
+        with self.lock:
+            return dict(self.stats)
+
+    def _synthesize(self, key):
+        text, voice, speed, use_cache = key
+        use_cache = use_cache and self.cache is not None
+        if use_cache:
+            with self.cache_lock:
+                cached = self.cache.get(text, voice, speed)
+            if cached is not None:
+                with self.lock:
+                    self.stats['cached'] += 1
+                return cached
+        audio, sample_rate = self.kokoro.generate(text, voice=voice, speed=speed)
+        audio = np.asarray(audio, dtype=np.float32)
+        with self.lock:
+            self.stats['synthesized'] += 1
+        if use_cache:
+            with self.cache_lock:
+                self.cache.put(text, voice, speed, audio, sample_rate)
+        return audio, sample_rate
+
+    def _dispatch(self):
+        while True:
+            batch = [self.jobs.get()]
+            deadline = time.monotonic() + BATCH_WINDOW
+            while len(batch) < MAX_BATCH:
+                try:
+                    batch.append(self.jobs.get(timeout=max(0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+
+            started = []
+            with self.lock:
+                self.stats['requests'] += len(batch)
+                self.stats['batches'] += 1
+                for job in batch:
+                    waiting = self.in_flight.get(job.key)
+                    if waiting is None:
+                        self.in_flight[job.key] = [job]
+                        started.append(job.key)
+                    else:
+                        waiting.append(job)
+                        self.stats['coalesced'] += 1
+
+            for key in started:
+                self.executor.submit(self._synthesize, key).add_done_callback(partial(self._complete, key))
+
+    def _complete(self, key, future):
+        """Done-callback: hand the result (or error) to every job waiting on `key`"""
+        with self.lock:
+            jobs = self.in_flight.pop(key)
+        try:
+            result, error = future.result(), None
+        except Exception as e:
+            result, error = None, e
+        for job in jobs:
+            job.result, job.error = result, error
+            job.done.set()
+
+def serve(path=SOCKET_PATH, use_cache=True):
+    """Load the model once and serve requests until interrupted"""
+    import signal
+    import socketserver
+    from kokoro_onnx import Kokoro
+
+    start = time.perf_counter()
+    kokoro = Kokoro()
+    cache = None
+    if use_cache:
+        import tts_cache
+        cache = tts_cache.SegmentCache()
+    service = TTSService(kokoro, cache)
+    print(f"🔊 Model loaded in {time.perf_counter() - start:.2f}s", flush=True)
+
+    class RequestHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                try:
+                    request = json.loads(line)
+                    if request.get('command') == 'stats':
+                        self.wfile.write((json.dumps(service.snapshot()) + '\n').encode())
+                        continue
+                    audio, sample_rate = service.submit(
+                        request['text'], request.get('voice', 'af'), request.get('speed', 1.0),
+                        use_cache=not request.get('no_cache')
+                    )
+                except Exception as e:
+                    self.wfile.write((json.dumps({'error': str(e)}) + '\n').encode())
+                    continue
+                data = np.ascontiguousarray(audio, dtype='<f4')
+                header = {'sample_rate': sample_rate, 'frames': len(data)}
+                self.wfile.write((json.dumps(header) + '\n').encode())
+                self.wfile.write(data.tobytes())
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if os.path.exists(path):
+        os.unlink(path)
+    server = socketserver.ThreadingUnixStreamServer(path, RequestHandler)
+    server.daemon_threads = True
+    os.chmod(path, 0o600)
+    # shutdown() blocks until serve_forever returns, so call it off the main thread
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: threading.Thread(target=server.shutdown).start())
+    print(f"🛰️  Listening on {path}", flush=True)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(path):
+            os.unlink(path)
+        print(f"👋 Service stopped ({json.dumps(service.snapshot())})")
+
+class TTSClient:
+    """Thin client; one connection is reused for a sequence of requests
+    (with use_cache=False they all bypass the service's segment cache)"""
+
+    def __init__(self, path=SOCKET_PATH, timeout=300.0, use_cache=True):
+        self.use_cache = use_cache
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        try:
+            self.sock.connect(path)
+        except OSError:
+            self.sock.close()
+            raise
+        self.reader = self.sock.makefile('rb')
+
+    def _request(self, request):
+        self.sock.sendall((json.dumps(request) + '\n').encode())
+        header = json.loads(self.reader.readline())
+        if 'error' in header:
+            raise RuntimeError(f"TTS service error: {header['error']}")
+        return header
+
+    def generate(self, text, voice='af', speed=1.0):
+        """Same shape as Kokoro.generate: (float32 audio, sample_rate)"""
+        request = {'text': text, 'voice': voice, 'speed': speed}
+        if not self.use_cache:
+            request['no_cache'] = True
+        header = self._request(request)
+        data = self.reader.read(header['frames'] * 4)
+        return np.frombuffer(data, dtype='<f4'), header['sample_rate']
+
+    def stats(self):
+        return self._request({'command': 'stats'})
+
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def available(path=SOCKET_PATH):
+    """True if a service is listening on `path`"""
+    try:
+        TTSClient(path, timeout=1.0).close()
+        return True
+    except OSError:
+        return False
+
+def main():
+    """Main entry point"""
+    command = sys.argv[1] if len(sys.argv) > 1 else 'serve'
+
+    if command == 'serve':
+        serve(use_cache='--no-cache' not in sys.argv[2:])
+
+    elif command == 'say':
+        import soundfile as sf
+        text = ' '.join(sys.argv[2:]) or "Hello from the TTS service."
+        start = time.perf_counter()
+        with TTSClient() as client:
+            audio, sample_rate = client.generate(text)
+        output_path = workspace_config.path('tts-say.wav')
+        sf.write(output_path, audio, sample_rate)
+        print(f"Audio saved to: {output_path} ({len(audio) / sample_rate:.1f}s audio "
+              f"in {time.perf_counter() - start:.2f}s)")
+
+    elif command == 'stats':
+        with TTSClient() as client:
+            print(json.dumps(client.stats(), indent=2))
+
+    else:
+        print(f"Usage: {sys.argv[0]} [serve [--no-cache]|say <text>|stats]")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Shared workspace configuration for the workspace scripts
+Resolves the workspace directory once and reads settings from the process
+environment, .env.local and .env (in that order of precedence). Parsed
+files are cached keyed on their mtime/size, so daemons and repeated
+lookups only re-stat() the files (at most once per RECHECK_INTERVAL) until
+a file actually changes.
+os.environ is never modified.
+
+  ./workspace_config.py              # workspace path and which keys come from where
+  ./workspace_config.py get X_USER_ID"""
+
+import os
+import sys
+import time
+
+WORKSPACE = os.path.abspath(os.path.expanduser(
+    os.environ.get('OPENCLAW_WORKSPACE') or '~/.openclaw/workspace'
+))
+
+# Later files override earlier ones
+ENV_FILES = ('.env', '.env.local')
+
+# Files are re-stat()ed at most this often (seconds), so tight loops don't
+# pay a syscall per lookup; edits show up within this window
+RECHECK_INTERVAL = 1.0
+
+# directory -> (monotonic time of last check, stamps of ENV_FILES, merged values)
+_cache = {}
+
+ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', '"': '"', '\\': '\\', '$': '$'}
+
+def path(*parts):
+    """Path inside the workspace"""
+    return os.path.join(WORKSPACE, *parts)
+
+def _unquote(value):
+    """Value part of a line: quoted ('...' literal, "..." with escapes) or bare with an optional ` # comment`"""
+    if value[:1] in ('"', "'"):
+        quote = value[0]
+        end = value.find(quote, 1)
+        if end != -1 and (quote == "'" or '\\' not in value[:end]):
+            return value[1:end]
+        out = []
+        i = 1
+        while i < len(value):
+            char = value[i]
+            if char == quote:
+                return ''.join(out)
+            if char == '\\' and quote == '"' and i + 1 < len(value):
+                i += 1
+                out.append(ESCAPES.get(value[i], '\\' + value[i]))
+            else:
+                out.append(char)
+            i += 1
+        # Unterminated quote: keep the text as written
+        return value
+    comment = value.find(' #')
+    if comment != -1:
+        value = value[:comment]
+    return value.strip()
+
+def parse_env(text):
+    """KEY=value pairs of a dotenv file (blank lines, comments and malformed lines are skipped)"""
+    values = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if line.startswith('export '):
+            line = line[len('export '):].lstrip()
+        key, sep, value = line.partition('=')
+        key = key.strip()
+        if not sep or not key.replace('_', '').isalnum():
+            continue
+        values[key] = _unquote(value.strip())
+    return values
+
+def _stamp(file_path):
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+def load(directory=None):
+    """Merged .env/.env.local values of `directory` (default: the workspace), re-parsed only when a file changes"""
+    directory = directory or WORKSPACE
+    now = time.monotonic()
+    cached = _cache.get(directory)
+    if cached and now - cached[0] < RECHECK_INTERVAL:
+        return cached[2]
+
+    files = [os.path.join(directory, name) for name in ENV_FILES]
+    stamps = tuple(_stamp(f) for f in files)
+    if cached and cached[1] == stamps:
+        _cache[directory] = (now, stamps, cached[2])
+        return cached[2]
+
+    values = {}
+    for file_path, stamp in zip(files, stamps):
+        if stamp is None:
+            continue
+        with open(file_path) as f:
+            values.update(parse_env(f.read()))
+    _cache[directory] = (now, stamps, values)
+    return values
+
+def get(key, default=None):
+    """Setting from the environment, else .env.local, else .env"""
+    value = os.environ.get(key)
+    if value is not None:
+        return value
+    return load().get(key, default)
+
+def main():
+    """Main entry point"""
+    command = sys.argv[1] if len(sys.argv) > 1 else 'show'
+
+    if command == 'show':
+        print(f"📁 Workspace: {WORKSPACE}")
+        sources = {}
+        for name in ENV_FILES:
+            if os.path.exists(path(name)):
+                with open(path(name)) as f:
+                    sources.update(dict.fromkeys(parse_env(f.read()), name))
+        for key in sorted(sources):
+            print(f"   {key} ({'environment' if key in os.environ else sources[key]})")
+
+    elif command == 'get' and len(sys.argv) > 2:
+        value = get(sys.argv[2])
+        if value is None:
+            sys.exit(1)
+        print(value)
+
+    else:
+        print(f"Usage: {sys.argv[0]} [show|get KEY]")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
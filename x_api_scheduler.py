@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""Rate-limit-aware scheduling layer around a tweepy Client
+Tracks x-rate-limit-* headers in a token bucket persisted across runs,
+serves repeat calls from an on-disk TTL cache, coalesces overlapping
+processes on a file lock and backs off with jitter on 429/5xx
+
+Responses carry `fetched_at` (epoch seconds of the API call that produced
+them), so a cached or stale response can be told apart from a fresh one
+
+tweepy is imported lazily: callers already hold a Client by the time
+anything here needs it, and importing this module stays cheap"""
+
+import os
+import json
+import time
+import fcntl
+import random
+import hashlib
+import threading
+from contextlib import contextmanager
+import workspace_config
+
+# Paths
+CACHE_DIR = workspace_config.path('data', 'x_api_cache')
+
+DEFAULT_TTL = 300           # seconds a cached response is served for
+DEFAULT_MAX_WAIT = 60       # longest we sleep for a rate-limit window before deferring
+MAX_RETRIES = 4
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 30.0
+
+# tweepy models that can appear in cached responses
+MODEL_TYPES = {'User', 'Tweet', 'Media', 'Place', 'Poll', 'List', 'Space', 'DirectMessageEvent'}
+
+class RateLimitDeferred(Exception):
+    """The call cannot run before `reset` and no cached response is available"""
+
+    def __init__(self, method, reset):
+        super().__init__(f"{method} rate limited until {time.strftime('%H:%M:%S', time.localtime(reset))}")
+        self.method = method
+        self.reset = reset
+
+def to_plain(value):
+    """tweepy Response/models -> JSON-able structure (models keep their class name)"""
+    import tweepy
+    if isinstance(value, tweepy.Response):
+        return {'__response__': [to_plain(part) for part in value]}
+    if isinstance(value, (list, tuple)):
+        return [to_plain(item) for item in value]
+    if isinstance(value, dict):
+        return {key: to_plain(item) for key, item in value.items()}
+    if hasattr(value, 'data') and type(value).__name__ in MODEL_TYPES:
+        return {'__model__': type(value).__name__, 'data': value.data}
+    return value
+
+def from_plain(value):
+    """Inverse of to_plain"""
+    import tweepy
+    if isinstance(value, list):
+        return [from_plain(item) for item in value]
+    if isinstance(value, dict):
+        if '__response__' in value:
+            return tweepy.Response(*from_plain(value['__response__']))
+        if '__model__' in value:
+            return getattr(tweepy, value['__model__'])(value['data'])
+        return {key: from_plain(item) for key, item in value.items()}
+    return value
+
+_fetched_type = None
+
+def with_fetched_at(response, fetched_at):
+    """`response` tagged with the time it was fetched (`response.fetched_at`);
+    non-Response return values are passed through unchanged"""
+    import tweepy
+    global _fetched_type
+    if not isinstance(response, tweepy.Response):
+        return response
+    if _fetched_type is None:
+        class FetchedResponse(tweepy.Response):
+            """tweepy Response plus the epoch it came from the API"""
+            fetched_at = None
+        _fetched_type = FetchedResponse
+    tagged = _fetched_type(*response)
+    tagged.fetched_at = fetched_at
+    return tagged
+
+def backoff_delay(attempt, base=BACKOFF_BASE, cap=BACKOFF_CAP):
+    """Full-jitter exponential backoff"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+class ScheduledClient:
+    """Drop-in wrapper: `client.get_users(...)` etc. go through the scheduler.
+
+    Buckets are keyed by client method name (one method = one X endpoint
+    here) and refilled to `limit` once `reset` passes. Remaining tokens are
+    decremented before each call so concurrent threads share the budget,
+    then corrected from the response headers.
+    """
+
+    def __init__(self, client, cache_dir=CACHE_DIR, ttl=DEFAULT_TTL, max_wait=DEFAULT_MAX_WAIT):
+        self.client = client
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_wait = max_wait
+        self.state_path = os.path.join(cache_dir, 'rate_limits.json')
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        os.makedirs(cache_dir, exist_ok=True)
+        client.session.hooks['response'].append(self._record_headers)
+
+    def __getattr__(self, name):
+        method = getattr(self.client, name)
+        if not callable(method):
+            return method
+        return lambda *args, **kwargs: self.call(name, *args, **kwargs)
+
+    @contextmanager
+    def _state(self):
+        """Read-modify-write the bucket file under a process + thread lock"""
+        with self._lock, open(self.state_path + '.lock', 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                with open(self.state_path) as f:
+                    state = json.load(f)
+            except (OSError, ValueError):
+                state = {}
+            yield state
+            tmp = f"{self.state_path}.{os.getpid()}.tmp"
+            with open(tmp, 'w') as f:
+                json.dump(state, f, indent=2)
+            os.replace(tmp, self.state_path)
+
+    def _take_token(self, method):
+        """Reserve a call; returns 0 when allowed, else the epoch the window resets"""
+        now = time.time()
+        with self._state() as state:
+            bucket = state.get(method)
+            if not bucket or now >= bucket['reset']:
+                return 0
+            if bucket['remaining'] > 0:
+                bucket['remaining'] -= 1
+                return 0
+            return bucket['reset']
+
+    def _record_headers(self, response, *args, **kwargs):
+        """requests response hook: sync the bucket with x-rate-limit-* headers"""
+        method = getattr(self._local, 'method', None)
+        headers = response.headers
+        if method and 'x-rate-limit-remaining' in headers:
+            with self._state() as state:
+                state[method] = {
+                    'limit': int(headers.get('x-rate-limit-limit', 0)),
+                    'remaining': int(headers['x-rate-limit-remaining']),
+                    'reset': int(headers.get('x-rate-limit-reset', time.time() + 900)),
+                }
+        return response
+
+    def _cache_path(self, method, args, kwargs):
+        key = json.dumps([method, args, sorted(kwargs.items())], default=str)
+        return os.path.join(self.cache_dir, hashlib.sha256(key.encode()).hexdigest()[:32] + '.json')
+
+    def _read_cache(self, path, max_age):
+        """Cached response tagged with its original fetch time, or None if missing/older than max_age"""
+        try:
+            fetched_at = os.path.getmtime(path)
+            if time.time() - fetched_at > max_age:
+                return None
+            with open(path) as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if isinstance(cached, dict) and 'fetched_at' in cached:
+            fetched_at, cached = cached['fetched_at'], cached['response']
+        return with_fetched_at(from_plain(cached), fetched_at)
+
+    def _write_cache(self, path, response, fetched_at):
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump({'fetched_at': fetched_at, 'response': to_plain(response)}, f)
+        os.replace(tmp, path)
+
+    def call(self, method, *args, **kwargs):
+        """Serve from cache, else wait for a token and call with retries.
+
+        Identical calls from overlapping processes coalesce on a per-call
+        file lock: the first one hits the API, the rest get its cached
+        response. If the window won't reset within `max_wait`, a stale
+        cached response is returned or RateLimitDeferred is raised.
+        Cached and stale responses keep the `fetched_at` of the original call.
+        """
+        import tweepy
+        path = self._cache_path(method, args, kwargs)
+        cached = self._read_cache(path, self.ttl)
+        if cached is not None:
+            return cached
+
+        with open(path + '.lock', 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            cached = self._read_cache(path, self.ttl)
+            if cached is not None:
+                return cached
+
+            attempt = 0
+            while True:
+                reset = self._take_token(method)
+                if reset:
+                    wait = reset - time.time() + 1
+                    if wait > self.max_wait:
+                        stale = self._read_cache(path, float('inf'))
+                        if stale is not None:
+                            return stale
+                        raise RateLimitDeferred(method, reset)
+                    time.sleep(max(0, wait))
+                    continue
+
+                self._local.method = method
+                try:
+                    fetched_at = time.time()
+                    response = getattr(self.client, method)(*args, **kwargs)
+                except (tweepy.TooManyRequests, tweepy.TwitterServerError) as e:
+                    if attempt >= MAX_RETRIES:
+                        raise
+                    delay = backoff_delay(attempt)
+                    if isinstance(e, tweepy.TooManyRequests):
+                        # Never retry before the advertised reset; the hook already zeroed the bucket
+                        reset = int(e.response.headers.get('x-rate-limit-reset', 0))
+                        delay = max(delay, reset - time.time() + 1)
+                        if delay > self.max_wait:
+                            stale = self._read_cache(path, float('inf'))
+                            if stale is not None:
+                                return stale
+                            raise RateLimitDeferred(method, time.time() + delay)
+                    attempt += 1
+                    time.sleep(delay)
+                    continue
+                finally:
+                    self._local.method = None
+
+                self._write_cache(path, response, fetched_at)
+                return with_fetched_at(response, fetched_at)
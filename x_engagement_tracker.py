@@ -1,74 +1,154 @@
 #!/usr/bin/env python3
 """X (Twitter) Engagement Tracker for @RemyLobster
-Loads creds from .env, fetches follower stats, compares to previous run"""
+Loads creds from .env (via workspace_config), fetches follower stats, compares to previous run
+(CLI over x_tracker; samples go to its configured storage)
+
+tweepy/requests load only on the commands that hit the API and NumPy only
+for `report`, so local commands start fast (see bench_tracker_startup.py)"""
 
 import os
 import sys
 import json
-from datetime import datetime
-import tweepy
+from datetime import datetime, timezone
+import x_history_store
+import x_api_scheduler
+import x_tracker
+import workspace_config
 
 # Paths
-WORKSPACE = '/Users/thindery/.openclaw/workspace'
-ENV_PATH = os.path.join(WORKSPACE, '.env')
-STATS_PATH = os.path.join(WORKSPACE, 'data', 'x_stats.json')
-
-def load_env():
-    """Load environment variables from .env file"""
-    if os.path.exists(ENV_PATH):
-        with open(ENV_PATH) as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    os.environ[key] = value
-
-def load_previous_stats():
-    """Load previous stats from JSON file"""
-    if os.path.exists(STATS_PATH):
+STATS_PATH = workspace_config.path('data', 'x_stats.json')
+SOCKET_PATH = workspace_config.path('data', 'x_tracker.sock')
+
+# Daemon polling (seconds); the free tier allows a users lookup every few minutes at best
+DEFAULT_POLL_INTERVAL = 900
+
+# Report windows (days) and the z-score that flags a daily follower delta
+REPORT_WINDOWS = (7, 30)
+ANOMALY_Z = 3.0
+DAILY_FIELDS = [('day', 'i8'), ('followers', 'i8'), ('following', 'i8'), ('tweets', 'i8')]
+
+def load_previous_stats(storage, username, before=None):
+    """Latest stored sample (optionally strictly before a timestamp) as a dict
+    (falls back to the legacy snapshot file)"""
+    previous = storage.latest(username, before)
+    if previous is None and os.path.exists(STATS_PATH):
         with open(STATS_PATH) as f:
             return json.load(f)
-    return None
-
-def save_current_stats(stats):
-    """Save current stats to JSON file"""
-    os.makedirs(os.path.dirname(STATS_PATH), exist_ok=True)
-    with open(STATS_PATH, 'w') as f:
-        json.dump(stats, f, indent=2)
+    return previous.to_dict() if previous else None
 
-def get_follower_stats():
+def get_follower_stats(client=None):
     """Fetch current follower stats from X API"""
-    load_env()
+    client = client or x_tracker.get_client()
+    return x_tracker.fetch_user(client, workspace_config.get('X_USER_ID') or x_tracker.DEFAULT_USER_ID)
+
+def next_tick(start, interval, now):
+    """First start + k*interval after `now`: fixed-rate schedule that never
+    drifts with poll duration and skips (rather than bunches) missed ticks"""
+    return start + (int((now - start) // interval) + 1) * interval
+
+def serve_latest(state, lock, path=SOCKET_PATH):
+    """Serve the daemon's latest stats as JSON on a Unix socket.
+
+    Protocol: connect, send a handle (or an empty line for every account)
+    terminated by a newline, read JSON until EOF.
+    """
+    import socketserver
+    import threading
     
-    client = tweepy.Client(
-        consumer_key=os.environ.get('X_API_KEY'),
-        consumer_secret=os.environ.get('X_API_SECRET'),
-        access_token=os.environ.get('X_ACCESS_TOKEN'),
-        access_token_secret=os.environ.get('X_ACCESS_TOKEN_SECRET')
-    )
+    class LatestHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            handle = self.rfile.readline(256).decode().strip()
+            with lock:
+                if handle:
+                    payload = state['accounts'].get(x_history_store.account_key(handle))
+                else:
+                    payload = dict(state)
+                data = json.dumps(payload).encode()
+            self.wfile.write(data)
     
-    user_id = os.environ.get('X_USER_ID') or '2019211763414110208'
+    if os.path.exists(path):
+        os.unlink(path)
+    server = socketserver.ThreadingUnixStreamServer(path, LatestHandler)
+    os.chmod(path, 0o600)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def read_latest(handle=None, path=SOCKET_PATH, timeout=2.0):
+    """Latest stats from a running daemon (one account, or the full state), None if it isn't running"""
+    import socket
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(path)
+            sock.sendall(((handle or '') + '\n').encode())
+            chunks = []
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+    except OSError:
+        return None
+    return json.loads(b''.join(chunks))
+
+def run_daemon(interval):
+    """Poll on a fixed-rate schedule with one long-lived client (and its
+    HTTP connection pool), append samples to the store, and serve the
+    latest numbers on SOCKET_PATH until SIGINT/SIGTERM."""
+    import time
+    import signal
+    import threading
     
-    # Fetch user data
-    user = client.get_user(
-        id=user_id,
-        user_fields=['public_metrics', 'description', 'username', 'name']
-    )
+    client = x_tracker.get_client(ttl=interval / 2)
+    try:
+        accounts = x_tracker.load_accounts()
+    except FileNotFoundError:
+        accounts = [workspace_config.get('X_USER_ID') or x_tracker.DEFAULT_USER_ID]
+    concurrency = int(workspace_config.get('X_FETCH_CONCURRENCY', x_tracker.DEFAULT_CONCURRENCY))
     
-    if not user or not user.data:
-        raise Exception("Failed to fetch user data")
+    storage = x_tracker.open_storage()
+    state = {'updated': None, 'next_poll': None, 'accounts': {}}
+    for username in storage.accounts():
+        # Accounts whose raw samples were all compacted away have no latest sample
+        sample = storage.latest(username)
+        if sample:
+            state['accounts'][x_history_store.account_key(username)] = sample.to_dict()
+    lock = threading.Lock()
+    server = serve_latest(state, lock, SOCKET_PATH)
     
-    metrics = user.data.public_metrics
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
     
-    return {
-        'date': datetime.now().isoformat(),
-        'username': user.data.username,
-        'name': user.data.name,
-        'followers': metrics.get('followers_count', 0),
-        'following': metrics.get('following_count', 0),
-        'tweets': metrics.get('tweet_count', 0),
-        'listed': metrics.get('listed_count', 0)
-    }
+    print(f"🛰️  Tracking {len(accounts)} account(s) every {interval:g}s; latest stats on {SOCKET_PATH}", flush=True)
+    start = time.monotonic()
+    try:
+        while not stop.is_set():
+            try:
+                samples, errors = x_tracker.fetch_portfolio(client, accounts, concurrency)
+                storage.append(samples)
+                with lock:
+                    for sample in samples:
+                        state['accounts'][sample.account] = sample.to_dict()
+                    state['updated'] = datetime.now().isoformat()
+                print(f"📊 {datetime.now():%H:%M:%S} {len(samples)} sample(s), {len(errors)} error(s)", flush=True)
+            except x_api_scheduler.RateLimitDeferred as e:
+                print(f"⏳ Deferred: {e}", flush=True)
+            except Exception as e:
+                print(f"❌ Poll failed: {e}", file=sys.stderr, flush=True)
+            
+            now = time.monotonic()
+            tick = next_tick(start, interval, now)
+            with lock:
+                state['next_poll'] = datetime.fromtimestamp(time.time() + tick - now).isoformat()
+            stop.wait(tick - now)
+    finally:
+        server.shutdown()
+        server.server_close()
+        if os.path.exists(SOCKET_PATH):
+            os.unlink(SOCKET_PATH)
+        storage.close()
+        print("👋 Daemon stopped")
 
 def format_summary(current, previous):
     """Format a human-readable summary"""
@@ -111,6 +191,114 @@ def format_summary(current, previous):
     
     return '\n'.join(lines)
 
+def rolling_sum(values, window):
+    """Trailing `window`-sized sums via one cumulative sum (len(values) - window + 1 entries)"""
+    import numpy as np
+    c = np.concatenate(([0.0], np.cumsum(values, dtype=float)))
+    return c[window:] - c[:-window]
+
+def analyze_history(daily):
+    """Vectorized growth analytics over a DAILY_FIELDS record array (one row per day with data).
+
+    Gaps are forward-filled onto a contiguous calendar so windows are
+    measured in days, not samples. Anomalies are daily follower deltas
+    more than ANOMALY_Z standard deviations from the trailing 30-day mean.
+    """
+    import numpy as np
+    days = daily['day'] // 86400
+    calendar = np.arange(days[0], days[-1] + 1)
+    pos = np.searchsorted(days, calendar, side='right') - 1
+    series = {name: daily[name][pos] for name in ('followers', 'following', 'tweets')}
+    deltas = {name: np.diff(values, prepend=values[0]) for name, values in series.items()}
+    
+    report = {
+        'start': int(calendar[0]) * 86400,
+        'end': int(calendar[-1]) * 86400,
+        'days': len(calendar),
+        'current': {name: int(values[-1]) for name, values in series.items()},
+        'windows': {},
+    }
+    for window in REPORT_WINDOWS:
+        span = min(window, len(calendar) - 1)
+        growth = {name: int(values[-1] - values[-1 - span]) for name, values in series.items()}
+        avg = {name: float(rolling_sum(d[1:], span)[-1] / span) if span else 0.0
+               for name, d in deltas.items()}
+        report['windows'][window] = {
+            'days': span,
+            'growth': growth,
+            'avg_daily': avg,
+            'followers_per_tweet': growth['followers'] / growth['tweets'] if growth['tweets'] else None,
+        }
+    
+    # Trailing mean/std of the previous 30 deltas (excluding the day itself)
+    d = deltas['followers'][1:].astype(float)
+    window = REPORT_WINDOWS[-1]
+    anomalies = []
+    if len(d) > window:
+        mean = rolling_sum(d, window)[:-1] / window
+        var = rolling_sum(d * d, window)[:-1] / window - mean ** 2
+        std = np.sqrt(np.maximum(var, 0))
+        current = d[window:]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z = np.where(std > 0, (current - mean) / std, 0.0)
+        flagged = np.flatnonzero(np.abs(z) > ANOMALY_Z)
+        anomalies = [
+            {'date': int(calendar[i + window + 1]) * 86400, 'delta': int(current[i]), 'z': round(float(z[i]), 1)}
+            for i in flagged
+        ]
+    report['anomalies'] = anomalies
+    return report
+
+def format_report(username, report, recent_days=90):
+    """Format analytics for one account"""
+    day = lambda ts: datetime.fromtimestamp(ts, timezone.utc).strftime('%Y-%m-%d')
+    current = report['current']
+    lines = [
+        f"📊 @{username} — {report['days']:,} days ({day(report['start'])} → {day(report['end'])})",
+        f"   📈 Followers: {current['followers']:,}   👥 Following: {current['following']:,}   "
+        f"📝 Tweets: {current['tweets']:,}",
+    ]
+    for window, stats in report['windows'].items():
+        growth = stats['growth']
+        per_tweet = stats['followers_per_tweet']
+        per_tweet = f"{per_tweet:+.2f}" if per_tweet is not None else "n/a"
+        lines.append(
+            f"   {window:>2}d: followers {growth['followers']:+,} ({stats['avg_daily']['followers']:+.1f}/day), "
+            f"following {growth['following']:+,}, tweets {growth['tweets']:+,}, followers/tweet {per_tweet}"
+        )
+    recent = [a for a in report['anomalies'] if a['date'] >= report['end'] - recent_days * 86400]
+    if recent:
+        lines.append(f"   ⚠️  Anomalies (last {recent_days}d, |z| > {ANOMALY_Z:g}):")
+        for anomaly in recent:
+            lines.append(f"      {day(anomaly['date'])}: {anomaly['delta']:+,} followers (z={anomaly['z']:+.1f})")
+    return '\n'.join(lines)
+
+def daily_rows(storage, username):
+    """(day, followers, following, tweets) with each UTC day's last sample:
+    from the SQLite rollups when available, else by scanning the samples"""
+    if isinstance(storage, x_tracker.SQLiteStorage):
+        return x_history_store.daily_series(storage.conn, username)
+    days = {}
+    for sample in storage.range(username):
+        days[sample.ts - sample.ts % 86400] = (sample.followers, sample.following, sample.tweets)
+    return ((day,) + values for day, values in days.items())
+
+def build_reports(usernames=None):
+    """Load each account's daily history from storage into NumPy and analyze it"""
+    import numpy as np
+    daily_dtype = np.dtype(DAILY_FIELDS)
+    with x_tracker.open_storage() as storage:
+        if isinstance(storage, x_tracker.SQLiteStorage):
+            # Roll up days completed since the last run so only today's samples are read raw
+            x_history_store.compact(storage.conn)
+        usernames = usernames or storage.accounts()
+        reports = {}
+        for username in usernames:
+            daily = np.fromiter(daily_rows(storage, username), dtype=daily_dtype)
+            if len(daily):
+                reports[username] = analyze_history(daily)
+        return reports
+
 def main():
     """Main entry point"""
     command = sys.argv[1] if len(sys.argv) > 1 else 'check'
@@ -120,31 +308,101 @@ def main():
             # Get current stats
             current = get_follower_stats()
             
-            # Load previous for comparison
-            previous = load_previous_stats()
-            
-            # Save current for next time
-            save_current_stats(current)
+            with x_tracker.open_storage() as storage:
+                # Load previous for comparison
+                previous = load_previous_stats(storage, current.username, current.ts)
+                
+                # Save current for next time
+                storage.append([current])
             
             # Print summary
-            summary = format_summary(current, previous)
+            summary = format_summary(current.to_dict(), previous)
             print(summary)
             
             # Also return stats as JSON on stderr for debugging
-            print(json.dumps(current), file=sys.stderr)
+            print(json.dumps(current.to_dict()), file=sys.stderr)
             
+        except x_api_scheduler.RateLimitDeferred as e:
+            print(f"⏳ Deferred: {e}")
         except Exception as e:
             print(f"❌ Failed to fetch stats: {e}", file=sys.stderr)
             sys.exit(1)
             
+    elif command == 'portfolio':
+        try:
+            accounts = x_tracker.load_accounts(sys.argv[2] if len(sys.argv) > 2 else None)
+            concurrency = int(workspace_config.get('X_FETCH_CONCURRENCY', x_tracker.DEFAULT_CONCURRENCY))
+            samples, errors = x_tracker.fetch_portfolio(x_tracker.get_client(), accounts, concurrency)
+            
+            # Previous samples first, then one batched write for the whole portfolio
+            with x_tracker.open_storage() as storage:
+                previous = {s.account: storage.latest(s.username, before=s.ts) for s in samples}
+                storage.append(samples)
+            
+            for sample in samples:
+                prev = previous[sample.account]
+                growth = sample.followers - prev.followers if prev else 0
+                print(f"📊 @{sample.username}: {sample.followers:,} followers ({growth:+,})")
+            for error in errors:
+                print(f"⚠️  {error.get('value', '?')}: {error.get('detail', error.get('title', 'lookup failed'))}")
+            print(f"\n✅ {len(samples)}/{len(accounts)} accounts fetched in "
+                  f"{len(x_tracker.chunk_lookups(accounts))} request(s)")
+            
+        except x_api_scheduler.RateLimitDeferred as e:
+            print(f"⏳ Deferred: {e}")
+        except Exception as e:
+            print(f"❌ Failed to fetch portfolio: {e}", file=sys.stderr)
+            sys.exit(1)
+        
+    elif command == 'summary':
+        # Latest stored sample vs the one before it - no API call
+        with x_tracker.open_storage() as storage:
+            for username in sys.argv[2:] or storage.accounts():
+                current = storage.latest(username)
+                if current:
+                    previous = storage.latest(username, before=current.ts)
+                    print(format_summary(current.to_dict(), previous.to_dict() if previous else None))
+                    print()
+        
+    elif command == 'report':
+        reports = build_reports(sys.argv[2:])
+        if not reports:
+            print("📊 No history yet - run `check` or `portfolio` first")
+        for username, report in reports.items():
+            print(format_report(username, report))
+            print()
+        
+    elif command == 'daemon':
+        interval = float(sys.argv[2]) if len(sys.argv) > 2 else \
+            float(workspace_config.get('X_POLL_INTERVAL', DEFAULT_POLL_INTERVAL))
+        run_daemon(interval)
+        
+    elif command == 'latest':
+        # Cached numbers from the daemon, falling back to the store - never calls the API
+        handle = sys.argv[2] if len(sys.argv) > 2 else None
+        latest = read_latest(handle, SOCKET_PATH)
+        if latest is None:
+            with x_tracker.open_storage() as storage:
+                samples = {}
+                for username in [handle] if handle else storage.accounts():
+                    sample = storage.latest(username)
+                    samples[x_history_store.account_key(username)] = sample.to_dict() if sample else None
+            latest = samples[x_history_store.account_key(handle)] if handle else {'accounts': samples}
+        print(json.dumps(latest, indent=2))
+        
     elif command == 'raw':
-        # Just output raw JSON
-        current = get_follower_stats()
-        print(json.dumps(current, indent=2))
-        save_current_stats(current)
+        # Just output raw JSON (repeat calls within the TTL are served from cache)
+        try:
+            current = get_follower_stats()
+        except x_api_scheduler.RateLimitDeferred as e:
+            print(f"⏳ Deferred: {e}", file=sys.stderr)
+            sys.exit(0)
+        print(json.dumps(current.to_dict(), indent=2))
+        with x_tracker.open_storage() as storage:
+            storage.append([current])
         
     else:
-        print(f"Usage: {sys.argv[0]} [check|raw]")
+        print(f"Usage: {sys.argv[0]} [check|raw|portfolio [accounts_file]|summary [handles...]|report [handles...]|daemon [interval]|latest [handle]]")
         sys.exit(1)
 
 if __name__ == '__main__':
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""Append-only history of X (Twitter) follower stats
+One SQLite row per sample, indexed on (account, timestamp); old data is
+rolled up into hourly/daily buckets by `compact`"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+from datetime import datetime
+import workspace_config
+
+# Paths
+STORE_PATH = workspace_config.get('X_HISTORY_DB') or workspace_config.path('data', 'x_history.db')
+LEGACY_PATHS = [
+    workspace_config.path('data', 'x_stats.json'),
+    workspace_config.path('memory', 'x_follower_stats.json'),
+]
+
+# Rollup resolutions and their bucket width in seconds (UTC-aligned)
+ROLLUPS = [('hour', 3600), ('day', 86400)]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    account TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    followers INTEGER NOT NULL,
+    following INTEGER NOT NULL,
+    tweets INTEGER NOT NULL,
+    listed INTEGER,
+    PRIMARY KEY (account, ts)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS rollups (
+    account TEXT NOT NULL,
+    resolution TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    samples INTEGER NOT NULL,
+    followers_min INTEGER NOT NULL,
+    followers_max INTEGER NOT NULL,
+    last_ts INTEGER NOT NULL,
+    followers INTEGER NOT NULL,
+    following INTEGER NOT NULL,
+    tweets INTEGER NOT NULL,
+    listed INTEGER,
+    PRIMARY KEY (account, resolution, bucket)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS accounts (
+    account TEXT PRIMARY KEY,
+    username TEXT,
+    name TEXT
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+def account_key(username):
+    """Normalize a handle ('@RemyLobster') to the store's account key"""
+    return username.lstrip('@').lower()
+
+def to_epoch(value):
+    """Accept epoch seconds or an ISO timestamp (naive = local time)"""
+    if isinstance(value, (int, float)):
+        return int(value)
+    return int(datetime.fromisoformat(value).timestamp())
+
+def open_store(path=STORE_PATH):
+    """Open (and create if needed) the history store"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA mmap_size=268435456")  # read pages straight from the mapped file
+    conn.executescript(SCHEMA)
+    return conn
+
+def append_samples(conn, samples):
+    """Append samples in one transaction; each is a dict with username,
+    date/timestamp, followers, following, tweets and optionally listed/name.
+    Only the new rows are written - history is never re-serialized."""
+    rows = []
+    accounts = {}
+    for sample in samples:
+        account = account_key(sample['username'])
+        ts = to_epoch(sample.get('timestamp', sample.get('date')))
+        rows.append((account, ts, sample['followers'], sample['following'],
+                     sample['tweets'], sample.get('listed')))
+        accounts[account] = (account, sample['username'], sample.get('name'))
+    return append_rows(conn, rows, accounts.values())
+
+def append_rows(conn, rows, accounts):
+    """Append (account, ts, followers, following, tweets, listed) rows and
+    upsert (account, username, name) in one transaction"""
+    with conn:
+        conn.executemany("""
+            INSERT OR REPLACE INTO samples (account, ts, followers, following, tweets, listed)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, rows)
+        conn.executemany("""
+            INSERT INTO accounts (account, username, name) VALUES (?, ?, ?)
+            ON CONFLICT(account) DO UPDATE SET
+                username = excluded.username,
+                name = COALESCE(excluded.name, accounts.name)
+        """, accounts)
+    return len(rows)
+
+def append_sample(conn, sample):
+    """Append a single sample"""
+    return append_samples(conn, [sample])
+
+def _sample_dict(row):
+    """Row (account, ts, followers, following, tweets, listed, username, name) -> tracker-style dict"""
+    account, ts, followers, following, tweets, listed, username, name = row
+    return {
+        'date': datetime.fromtimestamp(ts).isoformat(),
+        'username': username or account,
+        'name': name,
+        'followers': followers,
+        'following': following,
+        'tweets': tweets,
+        'listed': listed,
+    }
+
+def latest_sample(conn, username, before=None):
+    """Most recent sample for an account (optionally strictly before a timestamp), or None"""
+    row = latest_row(conn, username, before)
+    return _sample_dict(row) if row else None
+
+def _sample_query(account, start=None, end=None):
+    """SELECT over one account's rows in [start, end); bounds are only added
+    when given, so SQLite can seek the (account, ts) key instead of scanning"""
+    where = ["s.account = ?"]
+    params = [account]
+    if start is not None:
+        where.append("s.ts >= ?")
+        params.append(to_epoch(start))
+    if end is not None:
+        where.append("s.ts < ?")
+        params.append(to_epoch(end))
+    return f"""
+        SELECT s.account, s.ts, s.followers, s.following, s.tweets, s.listed, a.username, a.name
+        FROM samples s LEFT JOIN accounts a ON a.account = s.account
+        WHERE {' AND '.join(where)}
+    """, params
+
+def latest_row(conn, username, before=None):
+    """Most recent (account, ts, followers, following, tweets, listed, username, name) row, or None"""
+    sql, params = _sample_query(account_key(username), end=before)
+    return conn.execute(sql + " ORDER BY s.ts DESC LIMIT 1", params).fetchone()
+
+def iter_samples(conn, username, start=None, end=None):
+    """Yield an account's raw samples in time order within [start, end)"""
+    return map(_sample_dict, iter_rows(conn, username, start, end))
+
+def iter_rows(conn, username, start=None, end=None):
+    """Cursor over an account's raw rows (as latest_row) in time order within [start, end)"""
+    sql, params = _sample_query(account_key(username), start, end)
+    return conn.execute(sql + " ORDER BY s.ts", params)
+
+def list_accounts(conn):
+    """Display usernames of every account in the store"""
+    return [row[0] for row in conn.execute(
+        "SELECT COALESCE(username, account) FROM accounts ORDER BY account"
+    )]
+
+def daily_series(conn, username):
+    """Cursor of (day, followers, following, tweets) with each UTC day's last sample.
+
+    Days already compacted come from the daily rollups; only samples past
+    the compaction watermark are aggregated from the raw table, so reading
+    years of minute data touches one row per day.
+    """
+    account = account_key(username)
+    row = conn.execute("SELECT value FROM meta WHERE key = 'compacted_day'").fetchone()
+    mark = row[0] if row else 0
+    return conn.execute("""
+        SELECT bucket, followers, following, tweets FROM rollups
+        WHERE account = ? AND resolution = 'day' AND bucket < ?
+        UNION ALL
+        SELECT bucket, followers, following, tweets FROM (
+            SELECT (ts / 86400) * 86400 AS bucket, MAX(ts), followers, following, tweets
+            FROM samples WHERE account = ? AND ts >= ?
+            GROUP BY ts / 86400
+        )
+        ORDER BY bucket
+    """, (account, mark, account, mark))
+
+def compact(conn, now=None, raw_retention_days=None, full=False):
+    """Roll completed hours/days up into the rollups table.
+
+    Each resolution keeps a watermark so only buckets completed since the
+    last run are aggregated (`full` recomputes everything, e.g. after a
+    backfill). Raw samples are kept forever unless `raw_retention_days`
+    is given; they are only deleted once their day has been rolled up.
+    Returns {resolution: buckets written}.
+    """
+    now = int(now if now is not None else time.time())
+    written = {}
+    with conn:
+        for resolution, width in ROLLUPS:
+            key = f'compacted_{resolution}'
+            row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+            start = 0 if full or not row else row[0]
+            end = now - now % width
+            if end <= start:
+                written[resolution] = 0
+                continue
+            # Bare columns next to MAX(ts) come from the bucket's latest sample
+            cursor = conn.execute("""
+                INSERT OR REPLACE INTO rollups
+                    (account, resolution, bucket, samples, followers_min, followers_max,
+                     last_ts, followers, following, tweets, listed)
+                SELECT account, ?, (ts / ?) * ?, COUNT(*), MIN(followers), MAX(followers),
+                       MAX(ts), followers, following, tweets, listed
+                FROM samples
+                WHERE ts >= ? AND ts < ?
+                GROUP BY account, ts / ?
+            """, (resolution, width, width, start, end, width))
+            written[resolution] = cursor.rowcount
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, end))
+        if raw_retention_days is not None:
+            day_mark = conn.execute("SELECT value FROM meta WHERE key = 'compacted_day'").fetchone()
+            cutoff = min(now - raw_retention_days * 86400, day_mark[0] if day_mark else 0)
+            conn.execute("DELETE FROM samples WHERE ts < ?", (cutoff,))
+    return written
+
+def load_legacy_json(path):
+    """Read samples from x_stats.json (single snapshot) or x_follower_stats.json (history list)"""
+    with open(path) as f:
+        data = json.load(f)
+    if 'history' in data:
+        username = data.get('username', 'RemyLobster')
+        return [
+            dict(entry, username=username, name=data.get('display_name'))
+            for entry in data['history']
+        ]
+    return [data]
+
+def import_legacy_json(conn, paths=None):
+    """One-shot import of the old JSON files; safe to re-run (samples are keyed on account + time)"""
+    total = 0
+    for path in paths or LEGACY_PATHS:
+        if not os.path.exists(path):
+            continue
+        count = append_samples(conn, load_legacy_json(path))
+        print(f"✅ Imported {count} samples from {path}")
+        total += count
+    if total:
+        compact(conn, full=True)
+    return total
+
+def main():
+    """Main entry point"""
+    command = sys.argv[1] if len(sys.argv) > 1 else 'summary'
+    conn = open_store()
+
+    if command == 'import-json':
+        total = import_legacy_json(conn, sys.argv[2:] or None)
+        print(f"📦 {total} samples imported into {STORE_PATH}")
+
+    elif command == 'compact':
+        raw_days = int(sys.argv[2]) if len(sys.argv) > 2 else None
+        written = compact(conn, raw_retention_days=raw_days)
+        print(f"🗜️  Rollups written: {written['hour']} hourly, {written['day']} daily")
+
+    elif command == 'summary':
+        for account, username, count, first, last in conn.execute("""
+            SELECT s.account, a.username, COUNT(*), MIN(s.ts), MAX(s.ts)
+            FROM samples s LEFT JOIN accounts a ON a.account = s.account
+            GROUP BY s.account
+        """):
+            print(f"📊 @{username or account}: {count:,} samples, "
+                  f"{datetime.fromtimestamp(first):%Y-%m-%d} → {datetime.fromtimestamp(last):%Y-%m-%d}")
+
+    else:
+        print(f"Usage: {sys.argv[0]} [summary|import-json [files...]|compact [raw_retention_days]]")
+        sys.exit(1)
+
+    conn.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""Shared core of the X (Twitter) engagement trackers
+A typed sample record, pluggable sample storage (SQLite, JSON lines or
+in-memory) and the credential/client/fetch logic that
+x_engagement_tracker.py and memory/x_engagement_tracker.py wrap
+
+Storage is picked by X_TRACKER_STORAGE: 'sqlite:<path>' (default, the
+x_history_store database), 'json:<path>' (one JSON sample per line) or
+'memory'. tweepy/requests are only imported when a client is created."""
+
+import os
+import json
+from bisect import bisect_left
+from itertools import starmap
+from datetime import datetime
+import x_history_store
+import x_api_scheduler
+import workspace_config
+
+# Paths
+ACCOUNTS_PATH = workspace_config.path('data', 'x_accounts.txt')
+STORAGE = workspace_config.get('X_TRACKER_STORAGE') or 'sqlite:' + x_history_store.STORE_PATH
+
+DEFAULT_USER_ID = '2019211763414110208'
+
+# X API v2 users lookup accepts up to 100 ids/usernames per request
+USERS_PER_REQUEST = 100
+DEFAULT_CONCURRENCY = 4
+X_API_HOST = 'https://api.twitter.com'
+USER_FIELDS = ['public_metrics', 'description', 'username', 'name']
+
+class Sample:
+    """One follower-stats observation of an account at epoch second `ts`"""
+
+    __slots__ = ('account', 'ts', 'followers', 'following', 'tweets', 'listed', 'username', 'name')
+
+    def __init__(self, account, ts, followers, following, tweets, listed=None, username=None, name=None):
+        self.account = account
+        self.ts = ts
+        self.followers = followers
+        self.following = following
+        self.tweets = tweets
+        self.listed = listed
+        self.username = username or account
+        self.name = name
+
+    @classmethod
+    def from_user(cls, user, ts=None):
+        """From a tweepy User with public_metrics"""
+        metrics = user.public_metrics
+        return cls(
+            x_history_store.account_key(user.username),
+            int(ts if ts is not None else datetime.now().timestamp()),
+            metrics.get('followers_count', 0),
+            metrics.get('following_count', 0),
+            metrics.get('tweet_count', 0),
+            metrics.get('listed_count', 0),
+            user.username,
+            user.name,
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        """From a tracker-style dict ('date' ISO string), a legacy entry ('timestamp') or to_json()"""
+        ts = data.get('ts', data.get('timestamp', data.get('date')))
+        return cls(
+            x_history_store.account_key(data['username']),
+            x_history_store.to_epoch(ts),
+            data['followers'],
+            data['following'],
+            data['tweets'],
+            data.get('listed'),
+            data['username'],
+            data.get('name'),
+        )
+
+    def to_dict(self):
+        """Tracker-style dict (the shape the CLIs print and the daemon serves)"""
+        return {
+            'date': datetime.fromtimestamp(self.ts).isoformat(),
+            'username': self.username,
+            'name': self.name,
+            'followers': self.followers,
+            'following': self.following,
+            'tweets': self.tweets,
+            'listed': self.listed,
+        }
+
+    def to_json(self):
+        return {'ts': self.ts, 'username': self.username, 'name': self.name, 'followers': self.followers,
+                'following': self.following, 'tweets': self.tweets, 'listed': self.listed}
+
+    def row(self):
+        """x_history_store samples row"""
+        return (self.account, self.ts, self.followers, self.following, self.tweets, self.listed)
+
+    def __eq__(self, other):
+        if not isinstance(other, Sample):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.__slots__)
+
+    def __repr__(self):
+        return f"Sample(@{self.username}, {self.ts}, followers={self.followers})"
+
+class MemoryStorage:
+    """Samples held in per-account lists sorted by ts (same account+ts replaces)"""
+
+    def __init__(self):
+        self._series = {}
+
+    def append(self, samples):
+        """Add samples; returns how many were given"""
+        count = 0
+        for sample in samples:
+            stamps, items = self._series.setdefault(sample.account, ([], []))
+            if not stamps or sample.ts > stamps[-1]:
+                stamps.append(sample.ts)
+                items.append(sample)
+            else:
+                i = bisect_left(stamps, sample.ts)
+                if i < len(stamps) and stamps[i] == sample.ts:
+                    items[i] = sample
+                else:
+                    stamps.insert(i, sample.ts)
+                    items.insert(i, sample)
+            count += 1
+        return count
+
+    def latest(self, username, before=None):
+        """Most recent sample (optionally strictly before a timestamp), or None"""
+        stamps, items = self._series.get(x_history_store.account_key(username), ([], []))
+        i = len(stamps) if before is None else bisect_left(stamps, x_history_store.to_epoch(before))
+        return items[i - 1] if i else None
+
+    def range(self, username, start=None, end=None):
+        """An account's samples in time order within [start, end)"""
+        stamps, items = self._series.get(x_history_store.account_key(username), ([], []))
+        lo = 0 if start is None else bisect_left(stamps, x_history_store.to_epoch(start))
+        hi = len(stamps) if end is None else bisect_left(stamps, x_history_store.to_epoch(end))
+        return iter(items[lo:hi])
+
+    def accounts(self):
+        """Display usernames of every account"""
+        return [items[-1].username for _, (_, items) in sorted(self._series.items())]
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class JSONStorage(MemoryStorage):
+    """JSON lines file (one to_json() sample per line), loaded into memory
+    on open; appends only write the new lines"""
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        if os.path.exists(path):
+            with open(path) as f:
+                super().append(Sample.from_dict(json.loads(line)) for line in f if line.strip())
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def append(self, samples):
+        samples = list(samples)
+        with open(self.path, 'a') as f:
+            f.write(''.join(json.dumps(s.to_json(), separators=(',', ':')) + '\n' for s in samples))
+        return super().append(samples)
+
+class SQLiteStorage:
+    """The x_history_store database (the only backend with rollups/`report`)"""
+
+    def __init__(self, path=x_history_store.STORE_PATH):
+        self.path = path
+        self.conn = x_history_store.open_store(path)
+
+    def append(self, samples):
+        rows = []
+        accounts = {}
+        for sample in samples:
+            rows.append(sample.row())
+            accounts[sample.account] = (sample.account, sample.username, sample.name)
+        return x_history_store.append_rows(self.conn, rows, accounts.values())
+
+    def latest(self, username, before=None):
+        row = x_history_store.latest_row(self.conn, username, before)
+        return Sample(*row) if row else None
+
+    def range(self, username, start=None, end=None):
+        return starmap(Sample, x_history_store.iter_rows(self.conn, username, start, end))
+
+    def accounts(self):
+        return x_history_store.list_accounts(self.conn)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def open_storage(spec=None):
+    """Storage from a 'sqlite:<path>' / 'json:<path>' / 'memory' spec (default: STORAGE)"""
+    kind, _, path = (spec or STORAGE).partition(':')
+    if kind == 'memory':
+        return MemoryStorage()
+    if kind == 'json':
+        return JSONStorage(os.path.expanduser(path))
+    if kind == 'sqlite':
+        return SQLiteStorage(os.path.expanduser(path or x_history_store.STORE_PATH))
+    raise ValueError(f"Unknown storage {spec!r} (expected sqlite:<path>, json:<path> or memory)")
+
+def mount_base_url(session, base_url):
+    """Send requests meant for api.twitter.com to another base URL
+    (e.g. a local stub of the v2 users endpoint)"""
+    from requests.adapters import HTTPAdapter
+
+    class BaseURLAdapter(HTTPAdapter):
+        def send(self, request, **kwargs):
+            request.url = base_url.rstrip('/') + request.url[len(X_API_HOST):]
+            return super().send(request, **kwargs)
+
+    session.mount(X_API_HOST, BaseURLAdapter())
+
+def get_client(ttl=None):
+    """Create a scheduled Tweepy client from .env credentials
+    (X_API_BASE_URL overrides the API host, X_CACHE_TTL the response cache TTL)"""
+    import tweepy
+    config = workspace_config.get
+
+    client = tweepy.Client(
+        consumer_key=config('X_API_KEY'),
+        consumer_secret=config('X_API_SECRET'),
+        access_token=config('X_ACCESS_TOKEN'),
+        access_token_secret=config('X_ACCESS_TOKEN_SECRET')
+    )
+
+    base_url = config('X_API_BASE_URL')
+    if base_url:
+        mount_base_url(client.session, base_url)
+    return x_api_scheduler.ScheduledClient(
+        client,
+        ttl=ttl if ttl is not None else float(config('X_CACHE_TTL', x_api_scheduler.DEFAULT_TTL))
+    )
+
+def fetched_at(response):
+    """Epoch the response came from the API (responses served from the
+    scheduler's cache keep their original time), else now"""
+    return int(getattr(response, 'fetched_at', None) or datetime.now().timestamp())
+
+def fetch_user(client, user_id=None):
+    """Current stats of `user_id`, or of the authenticated account when None,
+    timestamped with when the API returned them"""
+    if user_id:
+        user = client.get_user(id=user_id, user_fields=USER_FIELDS)
+    else:
+        user = client.get_me(user_fields=USER_FIELDS)
+
+    if not user or not user.data:
+        raise Exception("Failed to fetch user data")
+    return Sample.from_user(user.data, fetched_at(user))
+
+def check(client, storage, user_id=None):
+    """Fetch one account, store the sample; returns (current, previous sample or None).
+    A cached response re-stores the same (account, ts), which replaces rather than duplicates."""
+    current = fetch_user(client, user_id)
+    previous = storage.latest(current.username, before=current.ts)
+    storage.append([current])
+    return current, previous
+
+def load_accounts(path=None):
+    """Read the portfolio: X_ACCOUNTS (comma-separated) or one ID/@handle per line"""
+    listed = workspace_config.get('X_ACCOUNTS')
+    if path is None and listed:
+        entries = listed.split(',')
+    else:
+        with open(path or ACCOUNTS_PATH) as f:
+            entries = [line.split('#', 1)[0] for line in f]
+
+    accounts = []
+    for entry in entries:
+        entry = entry.strip()
+        if entry and entry not in accounts:
+            accounts.append(entry)
+    return accounts
+
+def chunk_lookups(accounts, size=USERS_PER_REQUEST):
+    """Split accounts into get_users() calls: numeric IDs by id, everything else by username"""
+    ids = [a for a in accounts if a.isdigit()]
+    usernames = [a.lstrip('@') for a in accounts if not a.isdigit()]
+    chunks = []
+    for key, values in (('ids', ids), ('usernames', usernames)):
+        for i in range(0, len(values), size):
+            chunks.append({key: values[i:i + size]})
+    return chunks
+
+def fetch_portfolio(client, accounts, concurrency=DEFAULT_CONCURRENCY):
+    """Fetch stats for many accounts, one get_users() call per 100 accounts,
+    at most `concurrency` calls in flight. Samples are timestamped with
+    their response's fetch time. Returns (samples, errors)."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    def lookup(chunk):
+        return client.get_users(user_fields=USER_FIELDS, user_auth=True, **chunk)
+
+    samples = []
+    errors = []
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        for response in pool.map(lookup, chunk_lookups(accounts)):
+            ts = fetched_at(response)
+            samples.extend(Sample.from_user(user, ts) for user in response.data or [])
+            errors.extend(response.errors or [])
+    return samples, errors